@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+benchmarks for leatherman.fuzzy
+
+run every case against synthetic datasets, optionally save the results as a
+baseline and fail when a later run is slower than the baseline by more than
+the threshold.
+"""
+
+import os
+import sys
+import json
+import random
+import string
+import timeit
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from leatherman.fuzzy import MatchType, DEFAULT_MATCH_TYPES, fuzzy, match_items  # noqa: E402
+
+DEFAULT_SIZES = [1000, 10000, 100000]
+DEFAULT_PATTERN_COUNTS = [1, 10]
+DEFAULT_THRESHOLD = 0.2
+DEFAULT_REPEAT = 3
+SEED = 42
+
+WORDS = [
+    'api', 'web', 'db', 'cache', 'queue', 'auth', 'billing', 'search',
+    'gateway', 'worker', 'cron', 'proxy', 'metrics', 'logs', 'admin',
+]
+
+PATTERNS = {
+    MatchType.EXACT: lambda rng: make_name(rng),
+    MatchType.IGNORECASE: lambda rng: make_name(rng).upper(),
+    MatchType.PREFIX: lambda rng: rng.choice(WORDS) + '-',
+    MatchType.SUFFIX: lambda rng: '-' + random_suffix(rng, 2),
+    MatchType.CONTAINS: lambda rng: rng.choice(WORDS),
+    MatchType.GLOB: lambda rng: f'*-{rng.choice(WORDS)}-*',
+    MatchType.REGEX: lambda rng: f'^{rng.choice(WORDS)}-[a-z]+-\\d',
+    MatchType.APPROX: lambda rng: make_name(rng)[:-1] + 'x',
+}
+
+
+def random_suffix(rng, length):
+    return ''.join(rng.choice(string.ascii_lowercase + string.digits) for _ in range(length))
+
+
+def make_name(rng):
+    return f'{rng.choice(WORDS)}-{rng.choice(WORDS)}-{random_suffix(rng, 6)}'
+
+
+def make_items(size, seed=SEED):
+    rng = random.Random(seed)
+    return [make_name(rng) for _ in range(size)]
+
+
+def make_patterns(match_type, count, seed=SEED):
+    rng = random.Random(seed + count)
+    return [PATTERNS[match_type](rng) for _ in range(count)]
+
+
+def cases(size, pattern_counts):
+    items = make_items(size)
+    fuzzy_list = fuzzy(items)
+    fuzzy_dict = fuzzy({item: position for position, item in enumerate(items)})
+    for count in pattern_counts:
+        for match_type in MatchType:
+            patterns = make_patterns(match_type, count)
+            yield (
+                f'match_items[{match_type.name}]/{size}/{count}',
+                lambda patterns=patterns, match_type=match_type: match_items(
+                    items, patterns, [match_type]
+                ),
+            )
+        patterns = make_patterns(MatchType.CONTAINS, count)
+        yield (
+            f'FuzzyList.include[DEFAULT]/{size}/{count}',
+            lambda patterns=patterns: fuzzy_list.include(*patterns),
+        )
+        yield (
+            f'FuzzyDict.exclude[DEFAULT]/{size}/{count}',
+            lambda patterns=patterns: fuzzy_dict.exclude(
+                *patterns, match_types=DEFAULT_MATCH_TYPES
+            ),
+        )
+
+
+def measure(func, size, repeat):
+    seconds = min(timeit.repeat(func, number=1, repeat=repeat))
+    return {'seconds': seconds, 'items_per_second': size / seconds if seconds else float('inf')}
+
+
+def run(sizes, pattern_counts, repeat, select=None, verbose=True):
+    results = {}
+    for size in sizes:
+        for name, func in cases(size, pattern_counts):
+            if select and select not in name:
+                continue
+            results[name] = measure(func, size, repeat)
+            if verbose:
+                seconds, rate = results[name]['seconds'], results[name]['items_per_second']
+                print(f"{name:<48} {seconds * 1000:>10.3f}ms {rate:>14,.0f}/s")
+    return results
+
+
+def compare(results, baseline, threshold):
+    regressions = []
+    for name, result in sorted(results.items()):
+        if name not in baseline:
+            continue
+        expected = baseline[name]['items_per_second']
+        actual = result['items_per_second']
+        if actual < expected * (1 - threshold):
+            regressions += [(name, expected, actual)]
+    return regressions
+
+
+def parse_args(args=None):
+    parser = argparse.ArgumentParser(description='benchmark leatherman.fuzzy')
+    parser.add_argument(
+        '--sizes', type=int, nargs='+', default=DEFAULT_SIZES,
+        help='dataset sizes, e.g. 1000 10000 100000 1000000; default=%(default)s')
+    parser.add_argument(
+        '--patterns', type=int, nargs='+', default=DEFAULT_PATTERN_COUNTS,
+        help='pattern counts; default=%(default)s')
+    parser.add_argument(
+        '--repeat', type=int, default=DEFAULT_REPEAT,
+        help='timing repeats per case; default=%(default)s')
+    parser.add_argument('--select', help='only run cases whose name contains this string')
+    parser.add_argument('--save', metavar='PATH', help='save results as a baseline json file')
+    parser.add_argument(
+        '--compare', metavar='PATH', help='compare results against a baseline json file'
+    )
+    parser.add_argument(
+        '--threshold', type=float, default=DEFAULT_THRESHOLD,
+        help='allowed throughput regression as a fraction; default=%(default)s')
+    return parser.parse_args(args)
+
+
+def main(args=None):
+    ns = parse_args(args)
+    results = run(ns.sizes, ns.patterns, ns.repeat, ns.select)
+    if ns.save:
+        with open(ns.save, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+    if ns.compare:
+        with open(ns.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, ns.threshold)
+        for name, expected, actual in regressions:
+            print(
+                f"REGRESSION {name}: {actual:,.0f}/s < {expected:,.0f}/s "
+                f"(threshold={ns.threshold:.0%})"
+            )
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -3,18 +3,58 @@
 
 import os
 import re
+import time
+import random
+import logging
 import aiohttp
 import asyncio
+import threading
+import concurrent.futures
 
-from json import dumps as json_dumps
+from json import dumps as json_dumps, loads as json_loads
+from bisect import bisect_left
+from collections import deque, namedtuple, OrderedDict
+from weakref import WeakKeyDictionary
+from contextlib import asynccontextmanager
 from attrdict import AttrDict
-from datetime import datetime
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 from urllib.parse import urlparse
 from fnmatch import fnmatch
 
 from .newline import windows2unix
 from .singleton import Singleton
 
+POOL_LIMIT = 100
+POOL_LIMIT_PER_HOST = 0
+POOL_KEEPALIVE_TIMEOUT = 15
+POOL_TTL_DNS_CACHE = 10
+
+RETRY_ATTEMPTS = 3
+RETRY_BASE = 0.5
+RETRY_CAP = 30
+RETRY_STATUSES = (429, 502, 503, 504)
+RETRY_EXCEPTIONS = (aiohttp.ClientConnectionError, asyncio.TimeoutError)
+
+STREAM_CHUNK_SIZE = 1 << 16
+
+HISTORY_MAX_ENTRIES = 1000
+HISTORY_MAX_BYTES = 1 << 26
+HISTORY_REDACTED_HEADERS = ("authorization", "proxy-authorization", "cookie", "set-cookie")
+
+CACHE_MAXSIZE = 1024
+CACHE_TTL = 300
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, float("inf"))
+LATENCY_QUANTILES = (0.5, 0.95, 0.99)
+TRACE_PHASES = {
+    "pool": ("on_connection_queued_start", "on_connection_queued_end"),
+    "connect": ("on_connection_create_start", "on_connection_create_end"),
+    "dns": ("on_dns_resolvehost_start", "on_dns_resolvehost_end"),
+}
+
+log = logging.getLogger(__name__)
+
 
 class RaiseIfError(Exception):
     def __init__(self, call):
@@ -36,6 +76,511 @@ def get_proxy_value_from_env(key):
     return values[0] if values else None
 
 
+def header(headers, name, default=None):
+    name = name.lower()
+    for key, value in headers.items():
+        if key.lower() == name:
+            return value
+    return default
+
+
+def retry_after(headers):
+    value = header(headers, "Retry-After")
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+def content_type(headers):
+    return header(headers, "Content-Type", "").split(";")[0].strip().lower()
+
+
+def url_host(url):
+    # hostname[:port] only, so userinfo never reaches metric labels
+    parsed = urlparse(url)
+    host = parsed.hostname or ""
+    if ":" in host:
+        host = f"[{host}]"
+    try:
+        port = parsed.port
+    except ValueError:
+        port = None
+    return host if port is None else f"{host}:{port}"
+
+
+def label_value(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+async def write_chunk(sink, chunk):
+    result = sink.write(chunk) if hasattr(sink, "write") else sink(chunk)
+    if asyncio.iscoroutine(result):
+        await result
+
+
+def rewindable(sink):
+    return sink is None or isinstance(sink, (str, os.PathLike))
+
+
+async def drain(response, sink, chunk_size=STREAM_CHUNK_SIZE, progress=None):
+    progress = {} if progress is None else progress
+    if isinstance(sink, (str, os.PathLike)):
+        with open(sink, "wb") as f:
+            return await drain(response, f, chunk_size, progress)
+    progress["size"] = 0
+    async for chunk in response.content.iter_chunked(chunk_size):
+        await write_chunk(sink, chunk)
+        progress["size"] += len(chunk)
+    return progress["size"]
+
+
+class Recv:
+    # mapping keys; not a registered Mapping so AttrDict(call) hands back this object
+    # instead of copying it, which would decode text and json eagerly
+    fields = (
+        "headers",
+        "status",
+        "text",
+        "json",
+        "body",
+        "encoding",
+        "repeat",
+        "retries",
+        "datetime",
+        "sink",
+        "size",
+        "timings",
+    )
+
+    def __init__(
+        self,
+        headers,
+        status,
+        body,
+        encoding,
+        repeat,
+        retries,
+        datetime,
+        newlines=False,
+        sink=None,
+        size=None,
+        timings=None,
+    ):
+        self.headers = AttrDict(headers)
+        self.status = status
+        self.body = body
+        self.encoding = encoding
+        self.repeat = repeat
+        self.retries = retries
+        self.datetime = datetime
+        self.newlines = newlines
+        self.sink = sink
+        self.size = len(body) if size is None else size
+        self.timings = timings or {}
+        self._text = None
+        self._json = None
+
+    @property
+    def text(self):
+        if self._text is None and self.body is not None:
+            text = self.body.decode(self.encoding, errors="replace")
+            self._text = windows2unix(text) if self.newlines else text
+        return self._text
+
+    @property
+    def json(self):
+        if self._json is None and self.body and content_type(self.headers) == "application/json":
+            # wrapped like the rest of the call so nested values chain as attributes
+            self._json = AttrDict(json=json_loads(self.text)).json
+        return self._json
+
+    def __getitem__(self, key):
+        if key not in self.fields:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key, default=None):
+        return getattr(self, key) if key in self.fields else default
+
+    def keys(self):
+        return list(self.fields)
+
+    def __contains__(self, key):
+        return key in self.fields
+
+    def __iter__(self):
+        return iter(self.fields)
+
+    def __len__(self):
+        return len(self.fields)
+
+    def __repr__(self):
+        return f"Recv(status={self.status}, size={self.size}, sink={self.sink!r})"
+
+
+def redact_url(url):
+    if not url:
+        return url
+    parsed = urlparse(str(url))
+    if "@" not in parsed.netloc:
+        return url
+    return parsed._replace(netloc=parsed.netloc.rpartition("@")[2]).geturl()
+
+
+def redact_headers(headers):
+    if not headers:
+        return headers
+    return {
+        name: "<redacted>" if name.lower() in HISTORY_REDACTED_HEADERS else value
+        for name, value in headers.items()
+    }
+
+
+def call_record(call):
+    # spilled records are written to disk; keep credentials out of them
+    send, recv = call.send, call.recv
+    return dict(
+        send=dict(
+            method=send.method,
+            url=redact_url(send.url),
+            proxy=redact_url(send.proxy),
+            headers=redact_headers(send.headers),
+            json=send.json,
+            datetime=send.datetime.isoformat(),
+        ),
+        recv=dict(
+            status=recv.status,
+            headers=redact_headers(recv.headers),
+            size=recv.size,
+            repeat=recv.repeat,
+            retries=recv.retries,
+            sink=None if recv.sink is None else str(recv.sink),
+            timings=recv.timings,
+            datetime=recv.datetime.isoformat(),
+        ),
+    )
+
+
+class CallHistory:
+    def __init__(self, max_entries=HISTORY_MAX_ENTRIES, max_bytes=HISTORY_MAX_BYTES, spill=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.spill = spill
+        self.bytes = 0
+        self._calls = deque()
+        self._spill = None
+
+    def full(self):
+        entries = self.max_entries and len(self._calls) > self.max_entries
+        size = self.max_bytes and self.bytes > self.max_bytes
+        return len(self._calls) > 1 and bool(entries or size)
+
+    def append(self, call):
+        self._calls.append(call)
+        self.bytes += call.recv.size
+        while self.full():
+            self.bytes -= self._calls.popleft().recv.size
+        if self.spill is not None:
+            if self._spill is None:
+                self._spill = open(self.spill, "a", encoding="utf-8", buffering=1)
+            self._spill.write(json_dumps(call_record(call), default=str) + "\n")
+
+    def extend(self, calls):
+        for call in calls:
+            self.append(call)
+
+    def __iadd__(self, calls):
+        self.extend(calls)
+        return self
+
+    def clear(self):
+        self._calls.clear()
+        self.bytes = 0
+
+    def close(self):
+        if self._spill is not None:
+            self._spill.close()
+            self._spill = None
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return list(self._calls)[index]
+        return self._calls[index]
+
+    def __iter__(self):
+        return iter(self._calls)
+
+    def __len__(self):
+        return len(self._calls)
+
+    def __repr__(self):
+        return f"CallHistory(entries={len(self)}, bytes={self.bytes}, spill={self.spill!r})"
+
+
+def request_key(kw):
+    options = (
+        (key, repr(value)) for key, value in kw.items() if key != "url" and value is not None
+    )
+    return kw.get("url"), tuple(sorted(options))
+
+
+def cache_control(headers):
+    directives = {}
+    for directive in header(headers, "Cache-Control", "").split(","):
+        name, _, value = directive.strip().partition("=")
+        if name:
+            directives[name.lower()] = value.strip('"')
+    return directives
+
+
+CacheEntry = namedtuple("CacheEntry", ["call", "expires"])
+
+
+class ResponseCache:
+    def __init__(self, maxsize=CACHE_MAXSIZE, ttl=CACHE_TTL):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self._entries = OrderedDict()
+
+    def lifetime(self, headers):
+        directives = cache_control(headers)
+        if "no-store" in directives:
+            return None
+        if "no-cache" in directives:
+            return 0
+        try:
+            return min(self.ttl, int(directives["max-age"]))
+        except (KeyError, ValueError):
+            return self.ttl
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def fresh(self, key):
+        entry = self.get(key)
+        if entry is not None and entry.expires > time.monotonic():
+            self.hits += 1
+            return entry.call
+        self.misses += 1
+        return None
+
+    def validators(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return {}
+        headers = entry.call.recv.headers
+        validators = {
+            "If-None-Match": header(headers, "ETag"),
+            "If-Modified-Since": header(headers, "Last-Modified"),
+        }
+        return {name: value for name, value in validators.items() if value is not None}
+
+    def put(self, key, call):
+        lifetime = self.lifetime(call.recv.headers)
+        if lifetime is None or call.recv.status != 200 or call.recv.body is None:
+            self._entries.pop(key, None)
+            return
+        self._entries[key] = CacheEntry(call, time.monotonic() + lifetime)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def refresh(self, key, headers):
+        call = self._entries[key].call
+        # a 304 only carries the headers that changed; the rest come from the stored response
+        updated = {name.lower() for name in headers}
+        merged = {
+            name: value for name, value in call.recv.headers.items() if name.lower() not in updated
+        }
+        merged.update(headers)
+        lifetime = self.lifetime(merged)
+        self._entries[key] = CacheEntry(call, time.monotonic() + (lifetime or 0))
+        self.revalidations += 1
+        return call
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __repr__(self):
+        return (
+            f"ResponseCache(entries={len(self)}, hits={self.hits}, misses={self.misses}, "
+            f"revalidations={self.revalidations})"
+        )
+
+
+class Histogram:
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q):
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            if seen + count >= rank and count:
+                lower = self.buckets[index - 1] if index else 0.0
+                upper = self.buckets[index]
+                if upper == float("inf"):
+                    return lower
+                return lower + (upper - lower) * (rank - seen) / count
+            seen += count
+        return self.buckets[-2]
+
+    def snapshot(self):
+        quantiles = {f"p{round(q * 100)}": self.quantile(q) for q in LATENCY_QUANTILES}
+        return dict(count=self.count, sum=self.sum, **quantiles)
+
+
+class HostMetrics:
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.retries = 0
+        self.statuses = {}
+        self.phases = {}
+
+    def observe(self, timings):
+        for phase, seconds in timings.items():
+            self.phases.setdefault(phase, Histogram()).observe(seconds)
+
+    def snapshot(self):
+        return dict(
+            requests=self.requests,
+            errors=self.errors,
+            retries=self.retries,
+            statuses=dict(self.statuses),
+            phases={phase: histogram.snapshot() for phase, histogram in self.phases.items()},
+        )
+
+
+class Metrics:
+    def __init__(self):
+        self.hosts = {}
+        self._lock = threading.Lock()
+
+    def host(self, url):
+        host = url_host(url)
+        if host not in self.hosts:
+            self.hosts[host] = HostMetrics()
+        return self.hosts[host]
+
+    def record(self, url, timings, status):
+        with self._lock:
+            metrics = self.host(url)
+            metrics.requests += 1
+            metrics.statuses[status] = metrics.statuses.get(status, 0) + 1
+            if status >= 500:
+                metrics.errors += 1
+            metrics.observe(timings)
+
+    def error(self, url, timings):
+        with self._lock:
+            metrics = self.host(url)
+            metrics.requests += 1
+            metrics.errors += 1
+            metrics.observe(timings)
+
+    def retry(self, url):
+        with self._lock:
+            self.host(url).retries += 1
+
+    def clear(self):
+        with self._lock:
+            self.hosts.clear()
+
+    def snapshot(self):
+        with self._lock:
+            return {host: metrics.snapshot() for host, metrics in self.hosts.items()}
+
+    def prometheus(self, prefix="asyncrequests"):
+        lines = []
+        with self._lock:
+            hosts = [(label_value(host), metrics) for host, metrics in self.hosts.items()]
+            for name, kind, value in (
+                ("requests_total", "counter", lambda metrics: metrics.requests),
+                ("errors_total", "counter", lambda metrics: metrics.errors),
+                ("retries_total", "counter", lambda metrics: metrics.retries),
+            ):
+                lines += [f"# TYPE {prefix}_{name} {kind}"]
+                lines += [
+                    f'{prefix}_{name}{{host="{host}"}} {value(metrics)}' for host, metrics in hosts
+                ]
+            lines += [f"# TYPE {prefix}_phase_seconds histogram"]
+            for host, metrics in hosts:
+                for phase, histogram in metrics.phases.items():
+                    labels = f'host="{host}",phase="{label_value(phase)}"'
+                    cumulative = 0
+                    for bound, count in zip(histogram.buckets, histogram.counts):
+                        cumulative += count
+                        le = "+Inf" if bound == float("inf") else repr(float(bound))
+                        lines += [
+                            f'{prefix}_phase_seconds_bucket{{{labels},le="{le}"}} {cumulative}'
+                        ]
+                    lines += [f"{prefix}_phase_seconds_sum{{{labels}}} {histogram.sum}"]
+                    lines += [f"{prefix}_phase_seconds_count{{{labels}}} {histogram.count}"]
+        return "\n".join(lines) + "\n"
+
+
+def trace_config():
+    config = aiohttp.TraceConfig()
+
+    def timings(context):
+        request = context.trace_request_ctx
+        return request if isinstance(request, dict) else {}
+
+    def phase(name):
+        async def on_start(session, context, params):
+            context.__dict__.setdefault("marks", {})[name] = time.monotonic()
+
+        async def on_end(session, context, params):
+            started = context.__dict__.get("marks", {}).pop(name, None)
+            if started is not None:
+                request = timings(context)
+                request[name] = request.get(name, 0.0) + time.monotonic() - started
+
+        return on_start, on_end
+
+    async def on_request_start(session, context, params):
+        context.started = time.monotonic()
+
+    async def on_request_end(session, context, params):
+        timings(context)["ttfb"] = time.monotonic() - context.started
+
+    config.on_request_start.append(on_request_start)
+    config.on_request_end.append(on_request_end)
+    for name, (start, end) in TRACE_PHASES.items():
+        on_start, on_end = phase(name)
+        getattr(config, start).append(on_start)
+        getattr(config, end).append(on_end)
+    return config
+
+
 def ensure_http(url):
     if url:
         p = urlparse(url)
@@ -44,14 +589,131 @@ def ensure_http(url):
     return url
 
 
+class RetryBudget:
+    def __init__(self, retries):
+        self.remaining = retries
+
+    def spend(self):
+        if self.remaining <= 0:
+            return False
+        self.remaining -= 1
+        return True
+
+
+class RetryPolicy:
+    def __init__(
+        self,
+        attempts=RETRY_ATTEMPTS,
+        base=RETRY_BASE,
+        cap=RETRY_CAP,
+        statuses=RETRY_STATUSES,
+        exceptions=RETRY_EXCEPTIONS,
+        budget=None,
+    ):
+        self.attempts = attempts
+        self.base = base
+        self.cap = cap
+        self.statuses = statuses
+        self.exceptions = exceptions
+        self.budget = RetryBudget(budget) if isinstance(budget, int) else budget
+
+    def delay(self, attempt, after=None):
+        if after is not None:
+            return min(self.cap, after)
+        return random.uniform(0, min(self.cap, self.base * 2 ** attempt))
+
+    def allow(self, attempt):
+        if attempt + 1 >= self.attempts:
+            return False
+        return self.budget is None or self.budget.spend()
+
+    def retry_call(self, call, attempt):
+        return call.recv.status in self.statuses and self.allow(attempt)
+
+    def retry_error(self, error, attempt):
+        return isinstance(error, self.exceptions) and self.allow(attempt)
+
+
+class TokenBucket:
+    def __init__(self, rate, burst=None):
+        self.rate = rate
+        self.burst = burst or max(1, rate)
+        self._tokens = self.burst
+        self._stamp = time.monotonic()
+
+    async def acquire(self):
+        while True:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._stamp) * self.rate)
+            self._stamp = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+            await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class Throttle:
+    def __init__(self, concurrency=None, rate=None, per_host=False):
+        self.concurrency = concurrency
+        self.rate = rate
+        self.per_host = per_host
+        self._semaphore = asyncio.Semaphore(concurrency) if concurrency else None
+        self._buckets = {}
+
+    def bucket(self, url):
+        host = urlparse(url).hostname if self.per_host else None
+        if host not in self._buckets:
+            self._buckets[host] = TokenBucket(self.rate)
+        return self._buckets[host]
+
+    @asynccontextmanager
+    async def slot(self, url):
+        if self._semaphore:
+            await self._semaphore.acquire()
+        try:
+            if self.rate:
+                await self.bucket(url).acquire()
+            yield
+        finally:
+            if self._semaphore:
+                self._semaphore.release()
+
+
 class AsyncRequests(Singleton):
     def __init__(self):
-        self.calls = []
-        self._loop = asyncio.get_event_loop()
         self.http_proxy = ensure_http(get_proxy_value_from_env("http_proxy"))
         self.https_proxy = ensure_http(get_proxy_value_from_env("https_proxy"))
         self.no_proxy = get_proxy_value_from_env("no_proxy")
         self.no_proxies = re.split("[, ]+", self.no_proxy) if self.no_proxy else []
+        # the singleton re-runs __init__ on every construction; keep the live state and settings
+        calls = getattr(self, "calls", None)
+        self.calls = CallHistory() if calls is None else calls
+        self.pool = getattr(self, "pool", None) or dict(
+            limit=POOL_LIMIT,
+            limit_per_host=POOL_LIMIT_PER_HOST,
+            keepalive_timeout=POOL_KEEPALIVE_TIMEOUT,
+            ttl_dns_cache=POOL_TTL_DNS_CACHE,
+        )
+        self._sessions = getattr(self, "_sessions", None) or WeakKeyDictionary()
+        self._loop = getattr(self, "_loop", None)
+        self._thread = getattr(self, "_thread", None)
+        self._lock = getattr(self, "_lock", None) or threading.Lock()
+        self._inflight = getattr(self, "_inflight", None) or WeakKeyDictionary()
+        self.coalesce = getattr(self, "coalesce", True)
+        self.cache = getattr(self, "cache", None)
+        self.metrics = getattr(self, "metrics", None) or Metrics()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
 
     @property
     def call(self):
@@ -65,7 +727,123 @@ class AsyncRequests(Singleton):
             return None
         return {"http": self.http_proxy, "https": self.https_proxy}[p.scheme]
 
-    async def _request(
+    def configure_history(self, **options):
+        calls, self.calls = self.calls, CallHistory(**options)
+        calls.close()
+        self.calls.extend(calls)
+
+    def configure_cache(self, maxsize=CACHE_MAXSIZE, ttl=CACHE_TTL, coalesce=True):
+        self.cache = ResponseCache(maxsize, ttl) if maxsize else None
+        self.coalesce = coalesce
+
+    def configure(self, **pool):
+        unknown = set(pool) - set(self.pool)
+        if unknown:
+            raise TypeError(f"unknown pool settings={sorted(unknown)}")
+        self.close()
+        self.pool.update(pool)
+        # sessions the async API opened on callers' loops still hold the old pool; close them on
+        # their own loops and let the next call there build a fresh one
+        for loop, session in list(self._sessions.items()):
+            del self._sessions[loop]
+            if not session.closed and not loop.is_closed():
+                asyncio.run_coroutine_threadsafe(session.close(), loop)
+
+    @property
+    def loop(self):
+        with self._lock:
+            if self._loop is None or self._loop.is_closed():
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(
+                    target=self._loop.run_forever, name="AsyncRequests", daemon=True
+                )
+                self._thread.start()
+            return self._loop
+
+    def run(self, coroutine):
+        if self._thread is threading.current_thread():
+            raise RuntimeError(
+                "sync AsyncRequests methods cannot be called from its own loop; "
+                "await the a* methods"
+            )
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop).result()
+
+    @property
+    def session(self):
+        loop = asyncio.get_running_loop()
+        session = self._sessions.get(loop)
+        if session is None or session.closed:
+            connector = aiohttp.TCPConnector(**self.pool)
+            session = self._sessions[loop] = aiohttp.ClientSession(
+                connector=connector, trace_configs=[trace_config()]
+            )
+        return session
+
+    async def aclose(self):
+        session = self._sessions.pop(asyncio.get_running_loop(), None)
+        if session is not None and not session.closed:
+            await session.close()
+
+    def close(self):
+        with self._lock:
+            loop, thread, self._loop, self._thread = self._loop, self._thread, None, None
+        if loop is not None and not loop.is_closed():
+            asyncio.run_coroutine_threadsafe(self.aclose(), loop).result()
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+            loop.close()
+        self.calls.close()
+
+    async def _request(self, method, throttle=None, **kw):
+        # cache hits and coalesced duplicates never take a throttle slot; only real fetches do
+        coalescable = self.coalesce or self.cache is not None
+        if method != "GET" or kw.get("sink") is not None or not coalescable:
+            return await self._send(throttle, method, kw)
+        key = request_key(kw)
+        if self.cache is not None:
+            call = self.cache.fresh(key)
+            if call is not None:
+                return call
+        if not self.coalesce:
+            return await self._cached_call(key, kw, throttle)
+        inflight = self._inflight.setdefault(asyncio.get_running_loop(), {})
+        entry = inflight.get(key)
+        if entry is None:
+            task = asyncio.ensure_future(self._cached_call(key, kw, throttle))
+            entry = inflight[key] = [task, 0]
+            task.add_done_callback(
+                lambda done: inflight.pop(key, None) if inflight.get(key) is entry else None
+            )
+        task = entry[0]
+        entry[1] += 1
+        try:
+            return await asyncio.shield(task)
+        finally:
+            # the shared fetch is cancelled once its last waiter gives up on it
+            entry[1] -= 1
+            if not entry[1] and not task.done():
+                task.cancel()
+
+    async def _send(self, throttle, method, kw):
+        if throttle is None:
+            return await self._call(method, **kw)
+        async with throttle.slot(kw.get("url")):
+            return await self._call(method, **kw)
+
+    async def _cached_call(self, key, kw, throttle=None):
+        if self.cache is None:
+            return await self._send(throttle, "GET", kw)
+        cache = self.cache
+        validators = cache.validators(key)
+        if validators:
+            kw = dict(kw, headers=dict(kw.get("headers") or {}, **validators))
+        call = await self._send(throttle, "GET", kw)
+        if validators and call.recv.status == 304:
+            return cache.refresh(key, call.recv.headers)
+        cache.put(key, call)
+        return call
+
+    async def _call(
         self,
         method,
         url=None,
@@ -78,30 +856,43 @@ class AsyncRequests(Singleton):
         repeat_wait=3,
         repeat_delta=None,
         verify_ssl=True,
+        retry=None,
+        sink=None,
+        newlines=False,
+        chunk_size=STREAM_CHUNK_SIZE,
+        keep_response=False,
         **kwargs,
     ):
 
         start = datetime.now()
-        connector = aiohttp.TCPConnector(verify_ssl=verify_ssl)
-        async with aiohttp.ClientSession(
-            connector=connector, loop=self._loop
-        ) as session:
-            repeat = 0
-            while True:
-                send_datetime = datetime.utcnow()
-                proxy = self.proxy(url)
+        session = self.session
+        data = json_dumps(json) if json else None
+        repeat = 0
+        attempt = 0
+        while True:
+            send_datetime = datetime.now(timezone.utc)
+            proxy = self.proxy(url)
+            timings = {}
+            progress = {}
+            started = time.monotonic()
+            try:
                 async with session.request(
                     method,
                     url,
                     headers=headers,
                     proxy=proxy,
-                    auth=aiohttp.helpers.BasicAuth(*auth),
-                    data=json_dumps(json) if json else None,
+                    auth=aiohttp.helpers.BasicAuth(*auth) if auth else None,
+                    data=data,
+                    ssl=None if verify_ssl else False,
+                    trace_request_ctx=timings,
                     **kwargs,
                 ) as response:
 
-                    text = await response.text()
-                    recv_datetime = datetime.utcnow()
+                    if sink is not None and response.status < 300:
+                        body, size = None, await drain(response, sink, chunk_size, progress)
+                    else:
+                        body, size = await response.read(), None
+                    timings["total"] = time.monotonic() - started
                     send = AttrDict(
                         method=method,
                         url=url,
@@ -110,35 +901,103 @@ class AsyncRequests(Singleton):
                         headers=headers,
                         datetime=send_datetime,
                     )
-                    json = None
-                    if response.headers["Content-Type"] == "application/json":
-                        json = await response.json()
-                    recv = AttrDict(
+                    recv = Recv(
                         headers=dict(response.headers.items()),
                         status=response.status,
-                        text=windows2unix(text),
-                        json=json,
+                        body=body,
+                        encoding=response.charset or "utf-8",
                         repeat=repeat,
-                        datetime=datetime.utcnow(),
+                        retries=attempt,
+                        datetime=datetime.now(timezone.utc),
+                        newlines=newlines,
+                        sink=None if body is not None else sink,
+                        size=size,
+                        timings=timings,
                     )
-                    call = AttrDict(response=response, send=send, recv=recv)
-                self.calls += [call]
-                if repeat_if and repeat_if(call):
-                    delta = datetime.now() - start
-                    if repeat_delta and delta < repeat_delta:
-                        repeat += 1
-                        print(f"{delta} < {repeat_delta}; repeat {repeat}")
-                        await asyncio.sleep(repeat_wait)
-                        continue
-                if raise_if and raise_if(call):
-                    if raise_ex:
-                        raise raise_ex(call)
-                    raise RaiseIfError(call)
-                break
+                    call = AttrDict(
+                        response=response if keep_response else None, send=send, recv=recv
+                    )
+            except Exception as error:
+                timings["total"] = time.monotonic() - started
+                self.metrics.error(url, timings)
+                # a writer or callable sink cannot be rewound, so a retry would repeat the body
+                # after the partial prefix it already received
+                streamed = progress.get("size") and not rewindable(sink)
+                if retry is None or streamed or not retry.retry_error(error, attempt):
+                    raise
+                self.metrics.retry(url)
+                wait = retry.delay(attempt)
+                attempt += 1
+                log.warning(f"{method} {url} failed with {error!r}; retry {attempt} in {wait:.2f}s")
+                await asyncio.sleep(wait)
+                continue
+            self.calls.append(call)
+            self.metrics.record(url, timings, call.recv.status)
+            if retry is not None and retry.retry_call(call, attempt):
+                self.metrics.retry(url)
+                wait = retry.delay(attempt, retry_after(call.recv.headers))
+                attempt += 1
+                log.warning(
+                    f"{method} {url} returned {call.recv.status}; retry {attempt} in {wait:.2f}s"
+                )
+                await asyncio.sleep(wait)
+                continue
+            if repeat_if and repeat_if(call):
+                delta = datetime.now() - start
+                if repeat_delta and delta < repeat_delta:
+                    wait = repeat_wait if retry is None else retry.delay(repeat)
+                    repeat += 1
+                    log.info(f"{delta} < {repeat_delta}; repeat {repeat} in {wait:.2f}s")
+                    await asyncio.sleep(wait)
+                    continue
+            if raise_if and raise_if(call):
+                if raise_ex:
+                    raise raise_ex(call)
+                raise RaiseIfError(call)
+            break
         return call
 
+    async def chunks(
+        self,
+        method,
+        url=None,
+        auth=None,
+        headers=None,
+        json=None,
+        verify_ssl=True,
+        chunk_size=STREAM_CHUNK_SIZE,
+        **kwargs,
+    ):
+        async with self.session.request(
+            method,
+            url,
+            headers=headers,
+            proxy=self.proxy(url),
+            auth=aiohttp.helpers.BasicAuth(*auth) if auth else None,
+            data=json_dumps(json) if json else None,
+            ssl=None if verify_ssl else False,
+            **kwargs,
+        ) as response:
+            async for chunk in response.content.iter_chunked(chunk_size):
+                yield chunk
+
+    async def arequest(self, method, **kw):
+        return await self._request(method, **kw)
+
+    async def aget(self, **kw):
+        return await self._request("GET", **kw)
+
+    async def aput(self, **kw):
+        return await self._request("PUT", **kw)
+
+    async def apost(self, **kw):
+        return await self._request("POST", **kw)
+
+    async def adelete(self, **kw):
+        return await self._request("DELETE", **kw)
+
     def request(self, method, **kw):
-        return self._loop.run_until_complete(self._request(method, **kw))
+        return self.run(self._request(method, **kw))
 
     def get(self, **kw):
         return self.request("GET", **kw)
@@ -152,23 +1011,74 @@ class AsyncRequests(Singleton):
     def delete(self, **kw):
         return self.request("DELETE", **kw)
 
-    async def _requests(self, method, *kws):
-        futures = [asyncio.ensure_future(self._request(method, **kw)) for kw in kws]
+    async def _throttled(self, throttle, method, kw, retry=None):
+        return await self._request(method, throttle=throttle, **dict(dict(retry=retry), **kw))
+
+    async def _requests(
+        self, method, *kws, concurrency=None, rate=None, per_host=False, retry=None
+    ):
+        throttle = Throttle(concurrency, rate, per_host)
+        futures = [
+            asyncio.ensure_future(self._throttled(throttle, method, kw, retry)) for kw in kws
+        ]
         responses = await asyncio.gather(*futures)
         return responses
 
-    def requests(self, method, *kws):
-        future = asyncio.ensure_future(self._requests(method, *kws))
-        return self._loop.run_until_complete(future)
+    async def arequests(self, method, *kws, **options):
+        return await self._requests(method, *kws, **options)
+
+    async def agets(self, *kws, **options):
+        return await self._requests("GET", *kws, **options)
+
+    async def aputs(self, *kws, **options):
+        return await self._requests("PUT", *kws, **options)
+
+    async def aposts(self, *kws, **options):
+        return await self._requests("POST", *kws, **options)
+
+    async def adeletes(self, *kws, **options):
+        return await self._requests("DELETE", *kws, **options)
+
+    async def acompleted(
+        self, method, *kws, concurrency=None, rate=None, per_host=False, retry=None
+    ):
+        throttle = Throttle(concurrency, rate, per_host)
+        futures = [
+            asyncio.ensure_future(self._throttled(throttle, method, kw, retry)) for kw in kws
+        ]
+        try:
+            for future in asyncio.as_completed(futures):
+                yield await future
+        finally:
+            for future in futures:
+                future.cancel()
+
+    def requests(self, method, *kws, **options):
+        return self.run(self._requests(method, *kws, **options))
+
+    def as_completed(self, method, *kws, concurrency=None, rate=None, per_host=False, retry=None):
+        throttle = Throttle(concurrency, rate, per_host)
+        futures = [
+            asyncio.run_coroutine_threadsafe(
+                self._throttled(throttle, method, kw, retry), self.loop
+            )
+            for kw in kws
+        ]
+        try:
+            for future in concurrent.futures.as_completed(futures):
+                yield future.result()
+        finally:
+            for future in futures:
+                future.cancel()
 
-    def gets(self, *kws):
-        return self.requests("GET", *kws)
+    def gets(self, *kws, **options):
+        return self.requests("GET", *kws, **options)
 
-    def puts(self, *kws):
-        return self.requests("PUT", *kws)
+    def puts(self, *kws, **options):
+        return self.requests("PUT", *kws, **options)
 
-    def posts(self, *kws):
-        return self.requests("POST", *kws)
+    def posts(self, *kws, **options):
+        return self.requests("POST", *kws, **options)
 
-    def deletes(self, *kws):
-        return self.requests("DELETE", *kws)
+    def deletes(self, *kws, **options):
+        return self.requests("DELETE", *kws, **options)
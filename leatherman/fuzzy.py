@@ -1,10 +1,27 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
+import os
 import re
+import sys
+import mmap
+import heapq
+import struct
+import hashlib
 from enum import Enum
-from fnmatch import fnmatch
-from collections import OrderedDict
+from fnmatch import fnmatch, translate
+from array import array
+from bisect import bisect_left, bisect_right
+from itertools import accumulate, islice
+from functools import lru_cache
+from operator import itemgetter
+from collections import OrderedDict, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 
 class MatchType(Enum):
@@ -15,6 +32,7 @@ class MatchType(Enum):
     CONTAINS = 4
     GLOB = 5
     REGEX = 6
+    APPROX = 7
 
 
 class InvalidFuzzyTypeError(Exception):
@@ -23,16 +41,68 @@ class InvalidFuzzyTypeError(Exception):
         super(InvalidFuzzyTypeError, self).__init__(message)
 
 
+class UnknownFieldError(Exception):
+    def __init__(self, field, fields):
+        message = f"field={field} is not one of the defined fields={list(fields)}"
+        super(UnknownFieldError, self).__init__(message)
+
+
+class ReservedFieldError(Exception):
+    def __init__(self, field):
+        message = f"field={field} is reserved for include/exclude options={list(RESERVED_FIELDS)}"
+        super(ReservedFieldError, self).__init__(message)
+
+
+class InvalidIndexError(Exception):
+    def __init__(self, path):
+        message = f"path={path} is not a fuzzy index built for this platform"
+        super(InvalidIndexError, self).__init__(message)
+
+
+class StaleIndexError(Exception):
+    def __init__(self, path, source):
+        message = f"path={path} is stale relative to source={source}"
+        super(StaleIndexError, self).__init__(message)
+
+
+class BackendUnavailableError(Exception):
+    def __init__(self, backend, module):
+        message = f"backend={backend} requires the {module} module to be installed"
+        super(BackendUnavailableError, self).__init__(message)
+
+
 MATCH_FUNCS = {
     MatchType.EXACT: lambda item, pattern: pattern == item,
-    MatchType.IGNORECASE: lambda item, pattern: pattern.lower() == item.lower(),
+    MatchType.IGNORECASE: lambda item, pattern: pattern.casefold() == item.casefold(),
     MatchType.PREFIX: lambda item, pattern: item.startswith(pattern),
     MatchType.SUFFIX: lambda item, pattern: item.endswith(pattern),
     MatchType.CONTAINS: lambda item, pattern: pattern in item,
     MatchType.GLOB: lambda item, pattern: fnmatch(item, pattern),
     MatchType.REGEX: lambda item, pattern: re.search(pattern, item),
+    MatchType.APPROX: lambda item, pattern: approx_match(item, pattern),
 }
 
+BACKREF_REGEX = re.compile(r'\\[1-9]|\(\?P=')
+
+APPROX_MAX_DISTANCE = 2
+APPROX_CHARS_PER_EDIT = 4
+
+STREAM_MATCH_TYPES = [
+    MatchType.CONTAINS,
+]
+
+STREAM_CHUNK_SIZE = 1 << 20
+
+BACKENDS = (None, 'compact', 'numpy')
+
+RESERVED_FIELDS = ('self', 'match_types', 'workers')
+
+INDEX_MAGIC = b'LMFUZZY1'
+INDEX_HEADER = struct.Struct('<8s8sQQqq32s')
+
+PARALLEL_THRESHOLD = 50000
+PARALLEL_CHUNKS_PER_WORKER = 4
+
 DEFAULT_MATCH_TYPES = [
     MatchType.EXACT,
     MatchType.IGNORECASE,
@@ -41,45 +111,270 @@ DEFAULT_MATCH_TYPES = [
 ]
 
 
+class Missing:
+    def __repr__(self):
+        return 'MISSING'
+
+
+MISSING = Missing()
+
+
 def match_list(item_list, patterns, match_func, key_func, include):
-    if include:
-        return any([
-            any([
-                item_func(item)(item, patterns, match_func, key_func, include)
-                for item
-                in item_list
-            ])
-            for pattern
-            in patterns
-        ])
-    return all([
-        any([
-            item_func(item)(item, patterns, match_func, key_func, include)
-            for item
-            in item_list
-        ])
-        for pattern
-        in patterns
-    ])
+    matched = any(
+        item_func(item)(item, patterns, match_func, key_func, True)
+        for item
+        in item_list
+    )
+    return matched == include
 
 
 def match_item(item, patterns, match_func, key_func, include):
     item_string = key_func(item)
-    if include:
-        return any([
-            match_func(item_string, pattern)
-            for pattern
-            in patterns
-        ])
-    return all([
-        not match_func(item_string, pattern)
+    if not isinstance(item_string, str):
+        return match_strings(leaves(item_string), patterns, match_func, include)
+    matched = any(
+        match_func(item_string, pattern)
+        for pattern
+        in patterns
+    )
+    return matched == include
+
+
+def match_dict(item_dict, patterns, match_func, key_func, include):
+    return match_strings(item_strings(item_dict, key_func), patterns, match_func, include)
+
+
+def match_strings(item_strings, patterns, match_func, include):
+    matched = any(
+        match_func(item_string, pattern)
+        for item_string
+        in item_strings
+        for pattern
+        in patterns
+    )
+    return matched == include
+
+
+def leaves(value):
+    if isinstance(value, dict):
+        for child in value.values():
+            yield from leaves(child)
+    elif isinstance(value, (list, tuple)):
+        for child in value:
+            yield from leaves(child)
+    elif value is not MISSING:
+        yield value if isinstance(value, str) else str(value)
+
+
+def iter_strings(strings):
+    if isinstance(strings, str):
+        return (strings,)
+    return strings
+
+
+def item_strings(item, key_func):
+    func = item_func(item)
+    if func is match_list:
+        return tuple(
+            string
+            for child
+            in item
+            for string
+            in iter_strings(item_strings(child, key_func))
+        )
+    if func is match_dict and key_func is str:
+        return tuple(leaves(item))
+    value = key_func(item)
+    if isinstance(value, str):
+        return value
+    return tuple(leaves(value))
+
+
+def key_step(obj, segment, index):
+    # digit segments are dict keys first and only become positions for sequences
+    # (or int-keyed mappings) when the string key is missing
+    if index is not None and isinstance(obj, (list, tuple)):
+        try:
+            return obj[index]
+        except IndexError:
+            return MISSING
+    try:
+        return obj[segment]
+    except (KeyError, IndexError):
+        if index is None:
+            return MISSING
+    except TypeError:
+        if index is None:
+            return getattr(obj, segment, MISSING)
+    try:
+        return obj[index]
+    except (KeyError, IndexError):
+        return MISSING
+    except TypeError:
+        return getattr(obj, segment, MISSING)
+
+
+def compile_key_path(path):
+    segments = [
+        (segment, int(segment) if segment.isdigit() else None)
+        for segment
+        in path.split('.')
+    ]
+
+    def getter(obj):
+        for segment, index in segments:
+            obj = key_step(obj, segment, index)
+            if obj is MISSING:
+                return MISSING
+        return obj
+    return getter
+
+
+class KeyPath:
+    def __init__(self, *paths):
+        self.paths = paths
+        self._getters = [compile_key_path(path) for path in paths]
+
+
+    def __call__(self, item):
+        return tuple(
+            string
+            for getter
+            in self._getters
+            for string
+            in leaves(getter(item))
+        )
+
+
+    def __repr__(self):
+        return f"KeyPath{self.paths!r}"
+
+
+def key_path(*paths):
+    return KeyPath(*paths)
+
+
+def myers_peq(pattern):
+    peq = {}
+    for offset, char in enumerate(pattern):
+        peq[char] = peq.get(char, 0) | (1 << offset)
+    return peq
+
+
+def myers_distance(peq, length, text, max_distance=None):
+    if not length:
+        return len(text)
+    mask = (1 << length) - 1
+    high = 1 << (length - 1)
+    pv, mv, score = mask, 0, length
+    remaining = len(text)
+    for char in text:
+        eq = peq.get(char, 0)
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = mv | (~(xh | pv) & mask)
+        mh = pv & xh
+        if ph & high:
+            score += 1
+        elif mh & high:
+            score -= 1
+        ph = ((ph << 1) | 1) & mask
+        mh = (mh << 1) & mask
+        pv = mh | (~(xv | ph) & mask)
+        mv = ph & xv
+        remaining -= 1
+        if max_distance is not None and score - remaining > max_distance:
+            return max_distance + 1
+    return score
+
+
+def levenshtein(source, target, max_distance=None):
+    if max_distance is not None and abs(len(source) - len(target)) > max_distance:
+        return max_distance + 1
+    if len(source) < len(target):
+        source, target = target, source
+    return myers_distance(myers_peq(target), len(target), source, max_distance)
+
+
+def approx_limit(pattern, max_distance):
+    # short patterns tolerate fewer edits, otherwise 'ab' would match every key of up to 4 chars
+    return min(max_distance, len(pattern) // APPROX_CHARS_PER_EDIT)
+
+
+def approx_match(item_string, pattern, max_distance=APPROX_MAX_DISTANCE):
+    limit = approx_limit(pattern, max_distance)
+    return levenshtein(item_string, pattern, limit) <= limit
+
+
+def compile_approx(patterns, max_distance):
+    compiled = [
+        (len(pattern), myers_peq(pattern), approx_limit(pattern, max_distance))
         for pattern
         in patterns
-    ])
+    ]
+
+    def matcher(item_string):
+        for length, peq, limit in compiled:
+            if abs(len(item_string) - length) > limit:
+                continue
+            if myers_distance(peq, length, item_string, limit) <= limit:
+                return True
+        return False
+    return matcher
+
+
+def never(item_string):
+    return False
+
+
+def alternation(regexes):
+    return re.compile('|'.join(f'(?:{regex})' for regex in regexes))
+
 
+def compile_regexes(patterns):
+    compiled = [re.compile(pattern) for pattern in patterns]
+    if len(compiled) == 1:
+        return compiled[0].search
+    if not any(BACKREF_REGEX.search(pattern) for pattern in patterns):
+        try:
+            return alternation(patterns).search
+        except re.error:
+            pass
+    return lambda item_string: any(regex.search(item_string) for regex in compiled)
 
-def match_dict(item_dict, patterns, match_func, include):
-    raise NotImplementedError("This function is not yet implemented.")
+
+@lru_cache(maxsize=256)
+def _compile_patterns(match_type, patterns, max_distance):
+    if not patterns:
+        return never
+    if match_type == MatchType.EXACT:
+        return frozenset(patterns).__contains__
+    elif match_type == MatchType.IGNORECASE:
+        folded = frozenset(pattern.casefold() for pattern in patterns)
+        return lambda item_string: item_string.casefold() in folded
+    elif match_type == MatchType.PREFIX:
+        return lambda item_string: item_string.startswith(patterns)
+    elif match_type == MatchType.SUFFIX:
+        return lambda item_string: item_string.endswith(patterns)
+    elif match_type == MatchType.CONTAINS:
+        if len(patterns) == 1:
+            pattern, = patterns
+            return lambda item_string: pattern in item_string
+        return alternation(re.escape(pattern) for pattern in patterns).search
+    elif match_type == MatchType.GLOB:
+        return alternation(translate(pattern) for pattern in patterns).match
+    elif match_type == MatchType.REGEX:
+        return compile_regexes(patterns)
+    elif match_type == MatchType.APPROX:
+        return compile_approx(patterns, max_distance)
+    raise ValueError(f"Invalid match type: {match_type}")
+
+
+def compile_patterns(match_type, patterns, max_distance=APPROX_MAX_DISTANCE):
+    return _compile_patterns(match_type, tuple(patterns), max_distance)
+
+
+CONTAINER_NAMES = ('list', 'tuple', 'dict')
 
 
 def item_func(item):
@@ -90,50 +385,859 @@ def item_func(item):
     }.get(item.__class__.__name__, match_item)
 
 
-def match_items(items, patterns, match_types, key_func=str, include=True):
-    if '*' in patterns:
-        return items
+def flat_keys(items, key_func):
+    if any(cls.__name__ in CONTAINER_NAMES for cls in set(map(type, items))):
+        return None
+    keys = items if key_func is str else list(map(key_func, items))
+    if set(map(type, keys)) - {str}:
+        return None
+    return keys
+
+
+def compile_tiers(patterns, match_types, max_distance=APPROX_MAX_DISTANCE):
+    tiers = []
     for match_type in match_types:
         if match_type not in MATCH_FUNCS:
             raise ValueError(f"Invalid match type: {match_type}")
-        results = [
-            item
-            for item
-            in items
-            if item_func(item)(item, patterns, MATCH_FUNCS[match_type], key_func, include)
-        ]
-        if results:
-            return results
+        tiers += [(match_type, compile_patterns(match_type, patterns, max_distance), None)]
+    return tiers
+
+
+def item_tier(item, position, patterns, tiers, limit, key_func, include):
+    func = item_func(item)
+    strings = None
+    for tier in range(limit):
+        match_type, matcher, answer = tiers[tier]
+        if answer is not None and func is match_item:
+            passed = (position in answer) == include
+        else:
+            if strings is None:
+                strings = item_strings(item, key_func)
+            passed = strings_match(strings, matcher) == include
+        if passed:
+            return tier
+    return limit
+
+
+def strings_match(strings, matcher):
+    if isinstance(strings, str):
+        return bool(matcher(strings))
+    return any(matcher(string) for string in strings)
+
+
+def strings_tier(strings, tiers, limit, include):
+    for tier in range(limit):
+        if strings_match(strings, tiers[tier][1]) == include:
+            return tier
+    return limit
+
+
+def lookup_tier(lookup, match_type, patterns, count, include):
+    positions = lookup(match_type, patterns)
+    if positions is None or include:
+        return positions
+    excluded = set(positions)
+    return [position for position in range(count) if position not in excluded]
+
+
+def answer_tiers(lookup, patterns, tiers):
+    answered = []
+    for match_type, matcher, answer in tiers:
+        positions = lookup(match_type, patterns)
+        answered += [(match_type, matcher, None if positions is None else set(positions))]
+    return answered
+
+
+def cascade(items, count, classify, offset=0):
+    if count == 1:
+        for position, item in enumerate(items, offset):
+            if classify(position, item, 1) == 0:
+                yield position, item
+        return
+    best = count
+    results = []
+    for position, item in enumerate(items, offset):
+        tier = classify(position, item, min(best + 1, count))
+        if tier < best:
+            best, results = tier, [(position, item)]
+        elif tier == best < count:
+            results.append((position, item))
+    yield from results
+
+
+def keys_cascade(keys, tiers, include):
+    for match_type, matcher, answer in tiers:
+        if answer is not None:
+            if include:
+                positions = sorted(answer)
+            else:
+                positions = [position for position in range(len(keys)) if position not in answer]
+        elif include:
+            positions = [position for position, key in enumerate(keys) if matcher(key)]
+        else:
+            positions = [position for position, key in enumerate(keys) if not matcher(key)]
+        if positions:
+            return positions
     return []
 
 
-class FuzzyTuple(tuple):
-    def __init__(self, *args, key_func=str, match_types=None, **kwargs):
-        self._type = type(args[0])
+def item_cascade(items, patterns, tiers, key_func, include):
+    def classify(position, item, limit):
+        return item_tier(item, position, patterns, tiers, limit, key_func, include)
+    return cascade(items, len(tiers), classify)
+
+
+def match_chunk(offset, chunk, patterns, match_types, include, max_distance):
+    tiers = compile_tiers(patterns, match_types, max_distance)
+
+    def classify(position, strings, limit):
+        return strings_tier(strings, tiers, limit, include)
+    survivors = list(cascade(chunk, len(tiers), classify, offset))
+    if not survivors:
+        return len(tiers), []
+    best = strings_tier(survivors[0][1], tiers, len(tiers), include)
+    return best, [position for position, strings in survivors]
+
+
+def parallel_positions(items, patterns, match_types, key_func, include, workers, max_distance):
+    strings = [item_strings(item, key_func) for item in items]
+    size = -(-len(strings) // (workers * PARALLEL_CHUNKS_PER_WORKER))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(
+                match_chunk,
+                offset,
+                strings[offset:offset + size],
+                patterns,
+                match_types,
+                include,
+                max_distance,
+            )
+            for offset
+            in range(0, len(strings), size)
+        ]
+        chunks = [future.result() for future in futures]
+    best = min(chunk_best for chunk_best, positions in chunks)
+    return [
+        position
+        for chunk_best, positions
+        in chunks
+        if chunk_best == best
+        for position
+        in positions
+    ]
+
+
+def parallelizable(items, tiers, workers):
+    if not workers or workers < 2 or len(items) < PARALLEL_THRESHOLD:
+        return False
+    return all(answer is None for match_type, matcher, answer in tiers)
+
+
+def match_positions(
+    items,
+    patterns,
+    match_types,
+    key_func=str,
+    include=True,
+    lookup=None,
+    workers=None,
+    max_distance=APPROX_MAX_DISTANCE,
+):
+    if '*' in patterns:
+        return list(range(len(items)))
+    tiers = compile_tiers(patterns, match_types, max_distance)
+    if lookup:
+        while tiers:
+            positions = lookup_tier(lookup, tiers[0][0], patterns, len(items), include)
+            if positions is None:
+                break
+            if positions:
+                return positions
+            tiers = tiers[1:]
+        tiers = answer_tiers(lookup, patterns, tiers)
+    if not tiers:
+        return []
+    if parallelizable(items, tiers, workers):
+        match_types = [match_type for match_type, matcher, answer in tiers]
+        return parallel_positions(
+            items, patterns, match_types, key_func, include, workers, max_distance
+        )
+    keys = flat_keys(items, key_func)
+    if keys is not None:
+        return keys_cascade(keys, tiers, include)
+    return [position for position, item in item_cascade(items, patterns, tiers, key_func, include)]
+
+
+def filter_items(
+    items,
+    patterns,
+    match_types,
+    key_func=str,
+    include=True,
+    max_distance=APPROX_MAX_DISTANCE,
+):
+    if '*' in patterns:
+        yield from items
+        return
+    tiers = compile_tiers(patterns, match_types, max_distance)
+    for position, item in item_cascade(items, patterns, tiers, key_func, include):
+        yield item
+
+
+Score = namedtuple('Score', ['tier', 'position', 'ratio', 'distance', 'index'])
+
+
+def string_score(string, pattern, folded, tiers, distance):
+    tier = strings_tier(string, tiers, len(tiers), True)
+    if tier == len(tiers):
+        return None
+    folded_string = string.casefold()
+    position = folded_string.find(folded)
+    return (
+        tier,
+        position if position >= 0 else len(string),
+        -len(pattern) / max(len(string), 1),
+        levenshtein(folded_string, folded) if distance else 0,
+    )
+
+
+def item_score(strings, pattern, folded, tiers, distance):
+    if isinstance(strings, str):
+        return string_score(strings, pattern, folded, tiers, distance)
+    scores = [string_score(string, pattern, folded, tiers, distance) for string in strings]
+    scores = [score for score in scores if score is not None]
+    return min(scores) if scores else None
+
+
+def search_items(
+    items,
+    pattern,
+    limit=10,
+    match_types=None,
+    key_func=str,
+    distance=False,
+    max_distance=APPROX_MAX_DISTANCE,
+):
+    tiers = compile_tiers([pattern], match_types or DEFAULT_MATCH_TYPES, max_distance)
+    folded = pattern.casefold()
+
+    def scored():
+        for index, item in enumerate(items):
+            score = item_score(item_strings(item, key_func), pattern, folded, tiers, distance)
+            if score is not None:
+                yield Score(*score, index), item
+    if limit is None:
+        return sorted(scored(), key=itemgetter(0))
+    return heapq.nsmallest(limit, scored(), key=itemgetter(0))
+
+
+def match_items(
+    items,
+    patterns,
+    match_types,
+    key_func=str,
+    include=True,
+    workers=None,
+    max_distance=APPROX_MAX_DISTANCE,
+):
+    if '*' in patterns:
+        return items
+    items = items if isinstance(items, (list, tuple)) else list(items)
+    return [
+        items[position]
+        for position
+        in match_positions(
+            items,
+            patterns,
+            match_types,
+            key_func,
+            include,
+            workers=workers,
+            max_distance=max_distance,
+        )
+    ]
+
+
+class NgramIndex:
+    def __init__(self, keys=(), n=3):
+        self._n = n
+        self._keys = []
+        self._postings = {}
+        self.extend(keys)
+
+
+    def grams(self, string):
+        return {string[offset:offset + self._n] for offset in range(len(string) - self._n + 1)}
+
+
+    def append(self, key):
+        position = len(self._keys)
+        self._keys.append(key)
+        for gram in self.grams(key):
+            self._postings.setdefault(gram, []).append(position)
+
+
+    def extend(self, keys):
+        for key in keys:
+            self.append(key)
+
+
+    def candidates(self, pattern):
+        if len(pattern) < self._n:
+            return None
+        postings = sorted(
+            (self._postings.get(gram, ()) for gram in self.grams(pattern)),
+            key=len,
+        )
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            if not candidates:
+                break
+            candidates.intersection_update(posting)
+        return candidates
+
+
+    def lookup(self, match_type, patterns):
+        if match_type != MatchType.CONTAINS:
+            return None
+        positions = set()
+        for pattern in patterns:
+            candidates = self.candidates(pattern)
+            if candidates is None:
+                return None
+            positions.update(
+                position
+                for position
+                in candidates
+                if pattern in self._keys[position]
+            )
+        return sorted(positions)
+
+
+    def __len__(self):
+        return len(self._keys)
+
+
+class KeyBuffer:
+    def __init__(self, keys, max_distance=APPROX_MAX_DISTANCE):
+        keys = list(keys)
+        self._blob = ''.join(keys)
+        self._offsets = array('q', accumulate(map(len, keys), initial=0))
+        self._max_distance = max_distance
+        self._folded = None
+
+
+    def folded(self):
+        if self._folded is None:
+            self._folded = KeyBuffer((key.casefold() for key in self), self._max_distance)
+        return self._folded
+
+
+    def spans(self):
+        return enumerate(zip(self._offsets, islice(self._offsets, 1, None)))
+
+
+    def scan(self, pattern, exact):
+        blob, offsets, length = self._blob, self._offsets, len(pattern)
+        if not length:
+            return [
+                position
+                for position, (start, end)
+                in self.spans()
+                if not exact or start == end
+            ]
+        positions = []
+        hit = blob.find(pattern)
+        while hit != -1:
+            position = bisect_right(offsets, hit) - 1
+            start, end = offsets[position], offsets[position + 1]
+            if exact:
+                if hit == start and end - start == length:
+                    positions.append(position)
+                hit = blob.find(pattern, max(end, hit + 1))
+            elif hit + length <= end:
+                positions.append(position)
+                hit = blob.find(pattern, max(end, hit + 1))
+            else:
+                hit = blob.find(pattern, hit + 1)
+        return positions
+
+
+    def lookup(self, match_type, patterns):
+        blob = self._blob
+        if match_type == MatchType.EXACT:
+            found = [self.scan(pattern, True) for pattern in patterns]
+        elif match_type == MatchType.IGNORECASE:
+            folded = self.folded()
+            found = [folded.scan(pattern.casefold(), True) for pattern in patterns]
+        elif match_type == MatchType.CONTAINS:
+            found = [self.scan(pattern, False) for pattern in patterns]
+        elif match_type == MatchType.PREFIX:
+            prefixes = tuple(patterns)
+            return [
+                position
+                for position, (start, end)
+                in self.spans()
+                if blob.startswith(prefixes, start, end)
+            ]
+        elif match_type == MatchType.SUFFIX:
+            suffixes = tuple(patterns)
+            return [
+                position
+                for position, (start, end)
+                in self.spans()
+                if blob.endswith(suffixes, start, end)
+            ]
+        elif match_type == MatchType.GLOB:
+            matcher = compile_patterns(match_type, patterns)
+            return [
+                position
+                for position, (start, end)
+                in self.spans()
+                if matcher(blob, start, end)
+            ]
+        else:
+            matcher = compile_patterns(match_type, patterns, self._max_distance)
+            return [
+                position
+                for position, (start, end)
+                in self.spans()
+                if matcher(blob[start:end])
+            ]
+        if len(found) == 1:
+            return found[0]
+        return sorted(set().union(*found))
+
+
+    def __getitem__(self, position):
+        return self._blob[self._offsets[position]:self._offsets[position + 1]]
+
+
+    def __iter__(self):
+        for position, (start, end) in self.spans():
+            yield self._blob[start:end]
+
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+
+class NumpyKeys:
+    def __init__(self, keys):
+        self._keys = np.array(keys, dtype=str)
+        self._folded = None
+
+
+    def folded(self):
+        if self._folded is None:
+            self._folded = np.array([key.casefold() for key in self._keys.tolist()], dtype=str)
+        return self._folded
+
+
+    def mask(self, match_type, pattern):
+        if match_type == MatchType.EXACT:
+            return self._keys == pattern
+        elif match_type == MatchType.IGNORECASE:
+            return self.folded() == pattern.casefold()
+        elif match_type == MatchType.PREFIX:
+            return np.char.startswith(self._keys, pattern)
+        elif match_type == MatchType.SUFFIX:
+            return np.char.endswith(self._keys, pattern)
+        elif match_type == MatchType.CONTAINS:
+            return np.char.find(self._keys, pattern) >= 0
+        return None
+
+
+    def lookup(self, match_type, patterns):
+        mask = np.zeros(len(self._keys), dtype=bool)
+        for pattern in patterns:
+            found = self.mask(match_type, pattern)
+            if found is None:
+                return None
+            mask |= found
+        return np.flatnonzero(mask).tolist()
+
+
+    def __len__(self):
+        return len(self._keys)
+
+
+def flat_strings(items, key_func):
+    keys = [item_strings(item, key_func) for item in items]
+    if not all(isinstance(key, str) for key in keys):
+        return None
+    return keys
+
+
+def key_buffer(items, key_func, max_distance=APPROX_MAX_DISTANCE, backend='compact'):
+    keys = flat_strings(items, key_func)
+    if keys is None:
+        return None
+    if backend == 'numpy':
+        return NumpyKeys(keys)
+    return KeyBuffer(keys, max_distance)
+
+
+def compile_fields(fields):
+    compiled = {}
+    for name, spec in (fields or {}).items():
+        if name in RESERVED_FIELDS:
+            raise ReservedFieldError(name)
+        key_func, match_types = spec if isinstance(spec, tuple) else (spec, None)
+        if isinstance(key_func, str):
+            key_func = key_path(key_func)
+        compiled[name] = (key_func, match_types)
+    return compiled
+
+
+def field_columns(items, fields):
+    return {
+        name: [item_strings(item, key_func) for item in items]
+        for name, (key_func, match_types)
+        in fields.items()
+    }
+
+
+def match_fields(count, queries, include):
+    queries = [query for query in queries if '*' not in query[1]]
+    if not queries:
+        return list(range(count))
+
+    def classify(position, item, limit):
+        found = 0 if include else limit
+        for column, patterns, tiers in queries:
+            bound = min(limit, len(tiers))
+            tier = strings_tier(column[position], tiers, bound, include)
+            if include:
+                if tier == bound:
+                    return limit
+                found = max(found, tier)
+            elif tier < bound:
+                found = min(found, tier)
+                if found == 0:
+                    break
+        return found
+    count_tiers = max(len(tiers) for column, patterns, tiers in queries)
+    return [position for position, item in cascade(range(count), count_tiers, classify)]
+
+
+def field_positions(
+    items,
+    columns,
+    fields,
+    queried,
+    patterns,
+    match_types,
+    key_func=str,
+    include=True,
+    max_distance=APPROX_MAX_DISTANCE,
+):
+    queries = []
+    if patterns:
+        column = [item_strings(item, key_func) for item in items]
+        queries.append((column, patterns, compile_tiers(patterns, match_types, max_distance)))
+    for name, field_patterns in queried.items():
+        if name not in fields:
+            raise UnknownFieldError(name, fields)
+        if isinstance(field_patterns, str):
+            field_patterns = (field_patterns,)
+        field_patterns = tuple(field_patterns)
+        field_match_types = fields[name][1] or match_types
+        tiers = compile_tiers(field_patterns, field_match_types, max_distance)
+        queries.append((columns[name], field_patterns, tiers))
+    return match_fields(len(items), queries, include)
+
+
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'maxsize', 'currsize'])
+
+MONOTONE_MATCH_TYPES = (
+    (MatchType.PREFIX,),
+    (MatchType.CONTAINS,),
+)
+
+
+class QueryCache:
+    def __init__(self, maxsize=128):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._version = None
+        self._entries = OrderedDict()
+
+
+    def get(self, key):
+        positions = self._entries.get(key)
+        if positions is not None:
+            self._entries.move_to_end(key)
+        return positions
+
+
+    def put(self, key, positions):
+        self._entries[key] = positions
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+
+    def narrowed(self, patterns, match_types, include):
+        if not include or len(patterns) != 1 or match_types not in MONOTONE_MATCH_TYPES:
+            return None
+        pattern, = patterns
+        for end in range(len(pattern) - 1, -1, -1):
+            positions = self._entries.get(((pattern[:end],), match_types, include))
+            if positions is not None:
+                return positions
+        return None
+
+
+    def positions(self, version, patterns, match_types, include, match):
+        if version != self._version:
+            self._entries.clear()
+            self._version = version
+        key = (tuple(patterns), tuple(match_types), include)
+        positions = self.get(key)
+        if positions is not None:
+            self.hits += 1
+            return positions
+        self.misses += 1
+        positions = match(self.narrowed(*key))
+        self.put(key, positions)
+        return positions
+
+
+    def clear(self):
+        self._entries.clear()
+        self.hits = self.misses = 0
+
+
+    def info(self):
+        return CacheInfo(self.hits, self.misses, self.maxsize, len(self._entries))
+
+
+def cached_positions(cache, version, items, patterns, match_types, **kwargs):
+    def match(candidates):
+        if candidates is None:
+            return match_positions(items, patterns, match_types, **kwargs)
+        kwargs.pop('lookup', None)
+        positions = match_positions(
+            [items[candidate] for candidate in candidates], patterns, match_types, **kwargs
+        )
+        return [candidates[position] for position in positions]
+    if cache is None:
+        return match(None)
+    return cache.positions(version, patterns, match_types, kwargs.get('include', True), match)
+
+
+class FuzzySequence:
+    def init_fuzzy(self, key_func, match_types, ngram, cache, max_distance, backend, fields):
+        if backend not in BACKENDS:
+            raise ValueError(f"Invalid backend: {backend}")
+        if backend == 'numpy' and np is None:
+            raise BackendUnavailableError(backend, 'numpy')
         self._key_func = key_func
         self._match_types = match_types or DEFAULT_MATCH_TYPES
+        self._max_distance = max_distance
+        self._backend = backend
+        self._buffer = None
+        self._ngram = ngram
+        self._ngrams = None
+        self._version = 0
+        self._cache = QueryCache(cache) if cache else None
+        self._fields = compile_fields(fields)
+        self._columns = None
 
 
-    def include(self, *patterns, match_types=None):
-        items = match_items(
-            [item for item in self.__iter__()],
-            patterns,
-            match_types or self._match_types,
+    def cache_info(self):
+        if self._cache is None:
+            return None
+        return self._cache.info()
+
+
+    def columns(self):
+        if self._columns is None or self._columns[0] != self._version:
+            self._columns = (self._version, field_columns(list(self.__iter__()), self._fields))
+        return self._columns[1]
+
+
+    def ngrams(self):
+        if self._ngram and self._ngrams is None:
+            keys = flat_strings(self.__iter__(), self._key_func)
+            self._ngrams = False if keys is None else NgramIndex(keys)
+        return self._ngrams or None
+
+
+    def buffer(self):
+        if self._backend is None:
+            return None
+        if self._buffer is None or self._buffer[0] != self._version:
+            self._buffer = (
+                self._version,
+                key_buffer(self.__iter__(), self._key_func, self._max_distance, self._backend),
+            )
+        return self._buffer[1]
+
+
+    def lookup(self, match_type, patterns):
+        buffer = self.buffer()
+        if buffer is not None:
+            return buffer.lookup(match_type, patterns)
+        ngrams = self.ngrams()
+        if ngrams is None:
+            return None
+        return ngrams.lookup(match_type, patterns)
+
+
+    def select(self, patterns, match_types, include, workers=None, fields=None):
+        items = [item for item in self.__iter__()]
+        if fields:
+            positions = field_positions(
+                items,
+                self.columns(),
+                self._fields,
+                fields,
+                patterns,
+                match_types or self._match_types,
+                key_func=self._key_func,
+                include=include,
+                max_distance=self._max_distance,
+            )
+        else:
+            positions = cached_positions(
+                self._cache,
+                self._version,
+                items,
+                patterns,
+                match_types or self._match_types,
+                key_func=self._key_func,
+                include=include,
+                lookup=self.lookup,
+                workers=workers,
+                max_distance=self._max_distance,
+            )
+        return self.__class__(
+            [items[position] for position in positions],
             key_func=self._key_func,
-            include=True,
+            match_types=match_types or self._match_types,
+            ngram=self._ngram,
+            cache=self._cache and self._cache.maxsize,
+            max_distance=self._max_distance,
+            backend=self._backend,
+            fields=self._fields,
         )
-        return FuzzyTuple(items, key_func=self._key_func, match_types=match_types or self._match_types)
 
 
-    def exclude(self, *patterns, match_types=None):
-        items = match_items(
+    def include(self, *patterns, match_types=None, workers=None, **fields):
+        return self.select(patterns, match_types, True, workers, fields)
+
+
+    def exclude(self, *patterns, match_types=None, workers=None, **fields):
+        return self.select(patterns, match_types, False, workers, fields)
+
+
+    def search(self, pattern, limit=10, match_types=None, distance=False, scores=False):
+        results = search_items(
             [item for item in self.__iter__()],
-            patterns,
-            match_types or self._match_types,
+            pattern,
+            limit=limit,
+            match_types=match_types or self._match_types,
+            key_func=self._key_func,
+            distance=distance,
+            max_distance=self._max_distance,
+        )
+        if scores:
+            return results
+        return self.__class__(
+            [item for score, item in results],
+            key_func=self._key_func,
+            match_types=match_types or self._match_types,
+            ngram=self._ngram,
+            cache=self._cache and self._cache.maxsize,
+            max_distance=self._max_distance,
+            backend=self._backend,
+            fields=self._fields,
+        )
+
+
+    def lazy(self):
+        return FuzzyView(
+            self,
             key_func=self._key_func,
-            include=False,
+            match_types=self._match_types,
+            max_distance=self._max_distance,
+        )
+
+
+class FuzzyView:
+    def __init__(
+        self,
+        source,
+        key_func=str,
+        match_types=None,
+        steps=(),
+        max_distance=APPROX_MAX_DISTANCE,
+    ):
+        self._source = source
+        self._type = type(source)
+        self._key_func = key_func
+        self._match_types = match_types or DEFAULT_MATCH_TYPES
+        self._steps = steps
+        self._max_distance = max_distance
+
+
+    def chain(self, patterns, match_types, include):
+        step = (patterns, match_types or self._match_types, include)
+        return FuzzyView(
+            self._source,
+            self._key_func,
+            self._match_types,
+            self._steps + (step,),
+            self._max_distance,
         )
-        return FuzzyTuple(items, key_func=self._key_func, match_types=match_types or self._match_types)
+
+
+    def include(self, *patterns, match_types=None):
+        return self.chain(patterns, match_types, True)
+
+
+    def exclude(self, *patterns, match_types=None):
+        return self.chain(patterns, match_types, False)
+
+
+    def __iter__(self):
+        items = iter(self._source)
+        for patterns, match_types, include in self._steps:
+            items = filter_items(
+                items, patterns, match_types, self._key_func, include, self._max_distance
+            )
+        return items
+
+
+    def defuzz(self):
+        if issubclass(self._type, tuple):
+            return tuple(self)
+        return list(self)
+
+
+    def __repr__(self):
+        return f"FuzzyView({self._source!r}, steps={len(self._steps)})"
+
+
+class FuzzyTuple(FuzzySequence, tuple):
+    def __init__(
+        self,
+        *args,
+        key_func=str,
+        match_types=None,
+        ngram=False,
+        cache=None,
+        max_distance=APPROX_MAX_DISTANCE,
+        backend=None,
+        fields=None,
+        **kwargs,
+    ):
+        self._type = type(args[0])
+        self.init_fuzzy(key_func, match_types, ngram, cache, max_distance, backend, fields)
 
 
     def defuzz(self):
@@ -144,34 +1248,106 @@ class FuzzyTuple(tuple):
         return repr(tuple(self))
 
 
-class FuzzyList(list):
-    def __init__(self, *args, key_func=str, match_types=None, **kwargs):
+class FuzzyList(FuzzySequence, list):
+    def __init__(
+        self,
+        *args,
+        key_func=str,
+        match_types=None,
+        ngram=False,
+        cache=None,
+        max_distance=APPROX_MAX_DISTANCE,
+        backend=None,
+        fields=None,
+        **kwargs,
+    ):
         self._type = type(args[0])
-        self._key_func = key_func
-        self._match_types = match_types or DEFAULT_MATCH_TYPES
+        self.init_fuzzy(key_func, match_types, ngram, cache, max_distance, backend, fields)
         super().__init__(*args, **kwargs)
 
 
-    def include(self, *patterns, match_types=None):
-        items = match_items(
-            [item for item in self.__iter__()],
-            patterns,
-            match_types or self._match_types,
-            key_func=self._key_func,
-            include=True,
-        )
-        return FuzzyList(items, key_func=self._key_func, match_types=match_types or self._match_types)
+    def touch(self):
+        self._version += 1
 
 
-    def exclude(self, *patterns, match_types=None):
-        items = match_items(
-            [item for item in self.__iter__()],
-            patterns,
-            match_types or self._match_types,
-            key_func=self._key_func,
-            include=False,
-        )
-        return FuzzyList(items, key_func=self._key_func, match_types=match_types or self._match_types)
+    def invalidate(self):
+        self.touch()
+        self._ngrams = None
+
+
+    def append(self, item):
+        super().append(item)
+        self.touch()
+        if self._ngrams:
+            key = item_strings(item, self._key_func)
+            if isinstance(key, str):
+                self._ngrams.append(key)
+            else:
+                self._ngrams = False
+
+
+    def extend(self, items):
+        items = list(items)
+        super().extend(items)
+        self.touch()
+        if self._ngrams:
+            keys = flat_strings(items, self._key_func)
+            if keys is None:
+                self._ngrams = False
+            else:
+                self._ngrams.extend(keys)
+
+
+    def __iadd__(self, items):
+        self.extend(items)
+        return self
+
+
+    def insert(self, index, item):
+        super().insert(index, item)
+        self.invalidate()
+
+
+    def remove(self, item):
+        super().remove(item)
+        self.invalidate()
+
+
+    def pop(self, *args):
+        item = super().pop(*args)
+        self.invalidate()
+        return item
+
+
+    def clear(self):
+        super().clear()
+        self.invalidate()
+
+
+    def sort(self, *args, **kwargs):
+        super().sort(*args, **kwargs)
+        self.invalidate()
+
+
+    def reverse(self):
+        super().reverse()
+        self.invalidate()
+
+
+    def __setitem__(self, index, item):
+        super().__setitem__(index, item)
+        self.invalidate()
+
+
+    def __delitem__(self, index):
+        super().__delitem__(index)
+        self.invalidate()
+
+
+    def __imul__(self, count):
+        super().__imul__(count)
+        self.invalidate()
+        return self
 
 
     def defuzz(self):
@@ -179,28 +1355,159 @@ class FuzzyList(list):
 
 
 class FuzzyDict(OrderedDict):
-    def __init__(self, *args, key_func=str, match_types=None, **kwargs):
+    def __init__(
+        self,
+        *args,
+        key_func=str,
+        match_types=None,
+        cache=None,
+        max_distance=APPROX_MAX_DISTANCE,
+        fields=None,
+        **kwargs,
+    ):
         self._type = type(args[0])
         self._key_func = key_func
         self._match_types = match_types or DEFAULT_MATCH_TYPES
+        self._max_distance = max_distance
+        self._version = 0
+        self._cache = QueryCache(cache) if cache else None
+        self._fields = compile_fields(fields)
+        self._columns = None
         for key in args[0].keys():
             if not isinstance(key, str):
                 raise TypeError(f"All keys must be strings. Found key of type {type(key).__name__}")
         super().__init__(*args, **kwargs)
 
 
-    def include(self, *patterns, match_types=None):
-        items = match_items(
-            self.keys(), patterns, match_types or self._match_types, key_func=self._key_func, include=True
+    def touch(self):
+        self._version += 1
+
+
+    def cache_info(self):
+        if self._cache is None:
+            return None
+        return self._cache.info()
+
+
+    def columns(self):
+        if self._columns is None or self._columns[0] != self._version:
+            self._columns = (self._version, field_columns(list(self.values()), self._fields))
+        return self._columns[1]
+
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self.touch()
+
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self.touch()
+
+
+    def pop(self, *args):
+        value = super().pop(*args)
+        self.touch()
+        return value
+
+
+    def popitem(self, *args, **kwargs):
+        item = super().popitem(*args, **kwargs)
+        self.touch()
+        return item
+
+
+    def setdefault(self, key, default=None):
+        value = super().setdefault(key, default)
+        self.touch()
+        return value
+
+
+    def update(self, *args, **kwargs):
+        super().update(*args, **kwargs)
+        self.touch()
+
+
+    def clear(self):
+        super().clear()
+        self.touch()
+
+
+    def move_to_end(self, *args, **kwargs):
+        super().move_to_end(*args, **kwargs)
+        self.touch()
+
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+
+    def search(self, pattern, limit=10, match_types=None, distance=False, scores=False):
+        keys = list(self.keys())
+        items = keys if self._key_func is str else [self.get(key) for key in keys]
+        results = search_items(
+            items,
+            pattern,
+            limit=limit,
+            match_types=match_types or self._match_types,
+            key_func=self._key_func,
+            distance=distance,
+            max_distance=self._max_distance,
+        )
+        if scores:
+            return [(score, keys[score.index]) for score, item in results]
+        return FuzzyDict(
+            {keys[score.index]: self.get(keys[score.index]) for score, item in results},
+            key_func=self._key_func,
+            match_types=match_types or self._match_types,
+            max_distance=self._max_distance,
+            fields=self._fields,
         )
-        return FuzzyDict({item: self.get(item) for item in items}, key_func=self._key_func, match_types=match_types or self._match_types)
 
 
-    def exclude(self, *patterns, match_types=None):
-        items = match_items(
-            self.keys(), patterns, match_types or self._match_types, key_func=self._key_func, include=False
+    def select(self, patterns, match_types, include, workers=None, fields=None):
+        keys = list(self.keys())
+        items = keys if self._key_func is str else [self.get(key) for key in keys]
+        if fields:
+            positions = field_positions(
+                items,
+                self.columns(),
+                self._fields,
+                fields,
+                patterns,
+                match_types or self._match_types,
+                key_func=self._key_func,
+                include=include,
+                max_distance=self._max_distance,
+            )
+        else:
+            positions = cached_positions(
+                self._cache,
+                self._version,
+                items,
+                patterns,
+                match_types or self._match_types,
+                key_func=self._key_func,
+                include=include,
+                workers=workers,
+                max_distance=self._max_distance,
+            )
+        return FuzzyDict(
+            {keys[position]: self.get(keys[position]) for position in positions},
+            key_func=self._key_func,
+            match_types=match_types or self._match_types,
+            max_distance=self._max_distance,
+            fields=self._fields,
         )
-        return FuzzyDict({item: self.get(item) for item in items}, key_func=self._key_func, match_types=match_types or self._match_types)
+
+
+    def include(self, *patterns, match_types=None, workers=None, **fields):
+        return self.select(patterns, match_types, True, workers, fields)
+
+
+    def exclude(self, *patterns, match_types=None, workers=None, **fields):
+        return self.select(patterns, match_types, False, workers, fields)
 
 
     def defuzz(self):
@@ -211,16 +1518,483 @@ class FuzzyDict(OrderedDict):
         raise Exception(f"unknown type: {self._type}")
 
 
-def fuzzy(obj, key_func=str, match_types=None):
+class BKTree:
+    def __init__(self, keys=()):
+        self._root = None
+        for key in keys:
+            self.add(key)
+
+
+    def add(self, key):
+        if self._root is None:
+            self._root = (key, {})
+            return
+        node = self._root
+        while True:
+            word, children = node
+            distance = levenshtein(key, word)
+            if distance == 0:
+                return
+            if distance not in children:
+                children[distance] = (key, {})
+                return
+            node = children[distance]
+
+
+    def find(self, pattern, max_distance):
+        found = []
+        stack = [self._root] if self._root else []
+        while stack:
+            word, children = stack.pop()
+            distance = levenshtein(pattern, word)
+            if distance <= max_distance:
+                found.append(word)
+            stack.extend(
+                child
+                for edge, child
+                in children.items()
+                if distance - max_distance <= edge <= distance + max_distance
+            )
+        return found
+
+
+class FuzzyIndex:
+    def __init__(
+        self,
+        obj,
+        key_func=str,
+        match_types=None,
+        ngram=False,
+        max_distance=APPROX_MAX_DISTANCE,
+    ):
+        self._obj = obj
+        self._type = type(obj)
+        self._key_func = key_func
+        self._match_types = match_types or DEFAULT_MATCH_TYPES
+        self._max_distance = max_distance
+        self._items = list(obj)
+        if isinstance(obj, dict) and key_func is not str:
+            self._values = [obj[item] for item in self._items]
+        else:
+            self._values = self._items
+        self._keys = flat_strings(self._values, key_func)
+        self._exact = {}
+        self._folded = {}
+        for position, key in enumerate(self._keys or ()):
+            self._exact.setdefault(key, []).append(position)
+            self._folded.setdefault(key.casefold(), []).append(position)
+        self._prefixes = self.sort_keys(self._keys or [])
+        self._suffixes = self.sort_keys([key[::-1] for key in self._keys or ()])
+        self._ngrams = NgramIndex(self._keys) if ngram and self._keys is not None else None
+        self._bktree = None
+
+
+    def bktree(self):
+        if self._bktree is None:
+            self._bktree = BKTree(self._exact)
+        return self._bktree
+
+
+    @staticmethod
+    def sort_keys(keys):
+        order = sorted(range(len(keys)), key=keys.__getitem__)
+        return [keys[position] for position in order], order
+
+
+    @staticmethod
+    def scan_sorted(sorted_keys, order, prefix):
+        positions = []
+        start = bisect_left(sorted_keys, prefix)
+        for offset in range(start, len(sorted_keys)):
+            if not sorted_keys[offset].startswith(prefix):
+                break
+            positions.append(order[offset])
+        return positions
+
+
+    def lookup(self, match_type, patterns):
+        if self._keys is None:
+            return None
+        if match_type == MatchType.EXACT:
+            found = [self._exact.get(pattern, []) for pattern in patterns]
+        elif match_type == MatchType.IGNORECASE:
+            found = [self._folded.get(pattern.casefold(), []) for pattern in patterns]
+        elif match_type == MatchType.PREFIX:
+            found = [self.scan_sorted(*self._prefixes, pattern) for pattern in patterns]
+        elif match_type == MatchType.SUFFIX:
+            found = [self.scan_sorted(*self._suffixes, pattern[::-1]) for pattern in patterns]
+        elif match_type == MatchType.APPROX:
+            found = [
+                [
+                    position
+                    for word
+                    in self.bktree().find(pattern, approx_limit(pattern, self._max_distance))
+                    for position
+                    in self._exact[word]
+                ]
+                for pattern
+                in patterns
+            ]
+        elif self._ngrams is not None:
+            return self._ngrams.lookup(match_type, patterns)
+        else:
+            return None
+        if len(found) == 1:
+            return sorted(found[0])
+        return sorted(set().union(*found))
+
+
+    def positions(self, patterns, match_types, include):
+        return match_positions(
+            self._values if self._keys is None else self._keys,
+            patterns,
+            match_types or self._match_types,
+            key_func=self._key_func if self._keys is None else str,
+            include=include,
+            lookup=self.lookup,
+            max_distance=self._max_distance,
+        )
+
+
+    def wrap(self, positions, match_types):
+        items = [self._items[position] for position in positions]
+        match_types = match_types or self._match_types
+        if isinstance(self._obj, dict):
+            items = {item: self._obj[item] for item in items}
+        elif isinstance(self._obj, tuple):
+            items = tuple(items)
+        return fuzzy(
+            items,
+            key_func=self._key_func,
+            match_types=match_types,
+            max_distance=self._max_distance,
+        )
+
+
+    def include(self, *patterns, match_types=None):
+        return self.wrap(self.positions(patterns, match_types, True), match_types)
+
+
+    def exclude(self, *patterns, match_types=None):
+        return self.wrap(self.positions(patterns, match_types, False), match_types)
+
+
+    def defuzz(self):
+        return self._obj
+
+
+    def __iter__(self):
+        return iter(self._items)
+
+
+    def __len__(self):
+        return len(self._items)
+
+
+    def __repr__(self):
+        return f"FuzzyIndex({self._obj!r})"
+
+
+def reverse_key(key):
+    return key[::-1]
+
+
+def file_digest(path, chunk_size=STREAM_CHUNK_SIZE):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            digest.update(chunk)
+    return digest.digest()
+
+
+def source_fingerprint(source):
+    if source is None:
+        return 0, 0, bytes(32)
+    stat = os.stat(source)
+    return stat.st_mtime_ns, stat.st_size, file_digest(source)
+
+
+class SortedKeys:
+    def __init__(self, keys, order, transform):
+        self._keys = keys
+        self._order = order
+        self._transform = transform
+
+
+    def __getitem__(self, offset):
+        return self._transform(self._keys[self._order[offset]])
+
+
+    def __len__(self):
+        return len(self._order)
+
+
+class MappedIndex:
+    def __init__(self, path, match_types=None, max_distance=APPROX_MAX_DISTANCE):
+        self._path = path
+        self._match_types = match_types or DEFAULT_MATCH_TYPES
+        self._max_distance = max_distance
+        with open(path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size < INDEX_HEADER.size:
+                raise InvalidIndexError(path)
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, byteorder, count, size, *fingerprint = INDEX_HEADER.unpack_from(self._mmap)
+        native = magic == INDEX_MAGIC and byteorder.rstrip(b'\0') == sys.byteorder.encode()
+        expected = INDEX_HEADER.size + (count + 1) * 8 + 3 * count * 4 + size
+        if not native or len(self._mmap) < expected:
+            self._mmap.close()
+            raise InvalidIndexError(path)
+        self._count = count
+        self._fingerprint = tuple(fingerprint)
+        view = memoryview(self._mmap)
+        start = INDEX_HEADER.size
+        self._offsets = view[start:start + (count + 1) * 8].cast('Q')
+        start += (count + 1) * 8
+        orders = []
+        for section in range(3):
+            orders.append(view[start:start + count * 4].cast('I'))
+            start += count * 4
+        self._prefixes, self._folded, self._suffixes = orders
+        self._start = start
+        self._end = start + size
+        self._blob = view[start:start + size]
+        self._views = [self._offsets, *orders, self._blob, view]
+
+
+    def scan_sorted(self, order, transform, pattern, exact):
+        keys = SortedKeys(self, order, transform)
+        start = bisect_left(keys, pattern)
+        if exact:
+            return [order[offset] for offset in range(start, bisect_right(keys, pattern, start))]
+        positions = []
+        for offset in range(start, len(keys)):
+            if not keys[offset].startswith(pattern):
+                break
+            positions.append(order[offset])
+        return positions
+
+
+    def find(self, pattern):
+        needle = pattern.encode('utf-8')
+        if not needle:
+            return list(range(self._count))
+        positions = []
+        hit = self._mmap.find(needle, self._start, self._end)
+        while hit != -1:
+            offset = hit - self._start
+            position = bisect_right(self._offsets, offset) - 1
+            end = self._offsets[position + 1]
+            if offset + len(needle) <= end:
+                positions.append(position)
+                hit = self._mmap.find(needle, self._start + end, self._end)
+            else:
+                hit = self._mmap.find(needle, hit + 1, self._end)
+        return positions
+
+
+    def lookup(self, match_type, patterns):
+        if match_type == MatchType.EXACT:
+            found = [self.scan_sorted(self._prefixes, str, pattern, True) for pattern in patterns]
+        elif match_type == MatchType.IGNORECASE:
+            found = [
+                self.scan_sorted(self._folded, str.casefold, pattern.casefold(), True)
+                for pattern
+                in patterns
+            ]
+        elif match_type == MatchType.PREFIX:
+            found = [self.scan_sorted(self._prefixes, str, pattern, False) for pattern in patterns]
+        elif match_type == MatchType.SUFFIX:
+            found = [
+                self.scan_sorted(self._suffixes, reverse_key, pattern[::-1], False)
+                for pattern
+                in patterns
+            ]
+        elif match_type == MatchType.CONTAINS:
+            found = [self.find(pattern) for pattern in patterns]
+        else:
+            return None
+        if len(found) == 1:
+            return sorted(found[0])
+        return sorted(set().union(*found))
+
+
+    def stale(self, source, digest=False):
+        mtime_ns, size, checksum = self._fingerprint
+        if digest:
+            return file_digest(source) != checksum
+        stat = os.stat(source)
+        return (stat.st_mtime_ns, stat.st_size) != (mtime_ns, size)
+
+
+    def positions(self, patterns, match_types, include):
+        return match_positions(
+            self,
+            patterns,
+            match_types or self._match_types,
+            include=include,
+            lookup=self.lookup,
+            max_distance=self._max_distance,
+        )
+
+
+    def wrap(self, positions, match_types):
+        return fuzzy(
+            [self[position] for position in positions],
+            match_types=match_types or self._match_types,
+            max_distance=self._max_distance,
+        )
+
+
+    def include(self, *patterns, match_types=None):
+        return self.wrap(self.positions(patterns, match_types, True), match_types)
+
+
+    def exclude(self, *patterns, match_types=None):
+        return self.wrap(self.positions(patterns, match_types, False), match_types)
+
+
+    def defuzz(self):
+        return list(self)
+
+
+    def close(self):
+        for view in self._views:
+            view.release()
+        self._views = []
+        self._mmap.close()
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+    def __getitem__(self, position):
+        return str(self._blob[self._offsets[position]:self._offsets[position + 1]], 'utf-8')
+
+
+    def __iter__(self):
+        for position in range(self._count):
+            yield self[position]
+
+
+    def __len__(self):
+        return self._count
+
+
+    def __repr__(self):
+        return f"MappedIndex({self._path!r})"
+
+
+def save_index(items, path, key_func=str, source=None):
+    fingerprint = source_fingerprint(source)
+    keys = [key_func(item) for item in items]
+    encoded = [key.encode('utf-8') for key in keys]
+    offsets = array('Q', accumulate(map(len, encoded), initial=0))
+    header = INDEX_HEADER.pack(
+        INDEX_MAGIC, sys.byteorder.encode(), len(keys), offsets[-1], *fingerprint
+    )
+    temp = f"{path}.tmp"
+    with open(temp, 'wb') as f:
+        f.write(header)
+        offsets.tofile(f)
+        for transform in (str, str.casefold, reverse_key):
+            transformed = [transform(key) for key in keys]
+            array('I', sorted(range(len(keys)), key=transformed.__getitem__)).tofile(f)
+        for chunk in encoded:
+            f.write(chunk)
+    os.replace(temp, path)
+    return path
+
+
+def load_index(path, source=None, digest=False, rebuild=False, **kwargs):
+    if rebuild and source is not None and not os.path.exists(path):
+        save_index(read_lines(source), path, source=source)
+    index = MappedIndex(path, **kwargs)
+    if source is None or not index.stale(source, digest):
+        return index
+    index.close()
+    if not rebuild:
+        raise StaleIndexError(path, source)
+    save_index(read_lines(source), path, source=source)
+    return MappedIndex(path, **kwargs)
+
+
+def fuzzy(
+    obj,
+    key_func=str,
+    match_types=None,
+    index=False,
+    ngram=False,
+    lazy=False,
+    cache=None,
+    max_distance=APPROX_MAX_DISTANCE,
+    backend=None,
+    fields=None,
+):
+    options = dict(key_func=key_func, match_types=match_types, max_distance=max_distance)
+    if lazy:
+        if isinstance(obj, (str, bytes, dict)) or not hasattr(obj, '__iter__'):
+            raise InvalidFuzzyTypeError(obj)
+        return FuzzyView(obj, **options)
+    if index:
+        if not isinstance(obj, (tuple, list, dict)):
+            raise InvalidFuzzyTypeError(obj)
+        return FuzzyIndex(obj, ngram=ngram, **options)
     if isinstance(obj, tuple):
-        return FuzzyTuple(obj, key_func=key_func, match_types=match_types)
+        return FuzzyTuple(obj, ngram=ngram, cache=cache, backend=backend, fields=fields, **options)
     elif isinstance(obj, list):
-        return FuzzyList(obj, key_func=key_func, match_types=match_types)
+        return FuzzyList(obj, ngram=ngram, cache=cache, backend=backend, fields=fields, **options)
     elif isinstance(obj, dict):
-        return FuzzyDict(obj, key_func=key_func, match_types=match_types)
+        return FuzzyDict(obj, cache=cache, fields=fields, **options)
     raise InvalidFuzzyTypeError(obj)
 
 
+def read_lines(path, chunk_size=STREAM_CHUNK_SIZE, encoding='utf-8'):
+    with open(path, encoding=encoding, newline='') as f:
+        carry = ''
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            lines = (carry + chunk).split('\n')
+            carry = lines.pop()
+            for line in lines:
+                yield line[:-1] if line.endswith('\r') else line
+        if carry:
+            yield carry[:-1] if carry.endswith('\r') else carry
+
+
+def stream(
+    source,
+    patterns,
+    match_types=None,
+    key_func=str,
+    include=True,
+    max_distance=APPROX_MAX_DISTANCE,
+    chunk_size=STREAM_CHUNK_SIZE,
+    encoding='utf-8',
+):
+    if isinstance(source, (str, bytes, os.PathLike)):
+        source = read_lines(source, chunk_size, encoding)
+    if isinstance(patterns, str):
+        patterns = [patterns]
+    return filter_items(
+        source,
+        patterns,
+        match_types or STREAM_MATCH_TYPES,
+        key_func=key_func,
+        include=include,
+        max_distance=max_distance,
+    )
+
+
 if __name__ == "__main__":
     f = fuzzy(["a", "b"])
     print(f"f={f}")
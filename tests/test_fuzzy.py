@@ -35,7 +35,6 @@ def test_fuzzy_tuple_with_custom_key_func():
     assert result.defuzz() == (repos[0],)
 
 
-@pytest.mark.skip(reason='disabling this test for now, until dict case is fully implemented')
 def test_fuzzy_dict_with_custom_key_func():
     repos = {'a': Thing('apple'), 'b': Thing('banana'), 'c': Thing('cherry')}
     f = fuzzy(repos, key_func=thing_name)
@@ -52,6 +51,7 @@ def test_match_type_enum():
     assert MatchType.CONTAINS.value == 4
     assert MatchType.GLOB.value == 5
     assert MatchType.REGEX.value == 6
+    assert MatchType.APPROX.value == 7
     print("MatchType Enum test passed.")
 
 
@@ -383,3 +383,631 @@ def test_fuzzy_dict_non_string_keys():
     f = fuzzy({"1": "apple", "2": "banana"})
     result = f.include("1", match_types=[MatchType.EXACT])
     assert result.defuzz() == {"1": "apple"}
+
+
+def test_compile_patterns_matches_match_funcs():
+    items = ["apple", "Apple", "banana", "cherry", "pineapple", "apple.txt", "aa", ""]
+    patterns = ["apple", "an", "[a-c]*", "^a", "(a)\\1", "cher+y"]
+    for match_type in MatchType:
+        matcher = compile_patterns(match_type, patterns)
+        for item in items:
+            expected = any(MATCH_FUNCS[match_type](item, pattern) for pattern in patterns)
+            assert bool(matcher(item)) == bool(expected), (match_type, item)
+
+
+def test_compile_patterns_is_cached():
+    regex = compile_patterns(MatchType.REGEX, ["a", "b"])
+    assert regex is compile_patterns(MatchType.REGEX, ("a", "b"))
+
+
+def test_compile_patterns_empty():
+    for match_type in MatchType:
+        assert not compile_patterns(match_type, [])("apple")
+
+
+def test_compile_patterns_invalid_match_type():
+    with pytest.raises(ValueError):
+        compile_patterns("INVALID", ["apple"])
+
+
+def fall_through(items, patterns, match_types, include):
+    for match_type in match_types:
+        results = [
+            item
+            for item
+            in items
+            if match_item(item, patterns, MATCH_FUNCS[match_type], str, include)
+        ]
+        if results:
+            return results
+    return []
+
+
+def test_match_items_cascade_matches_fall_through():
+    items = ["apple", "APPLE", "applesauce", "pineapple", "banana", "Bandana", "cherry"]
+    for patterns in (["apple"], ["APPLE"], ["app"], ["nan"], ["ban", "che"], ["zzz"]):
+        for include in (True, False):
+            expected = fall_through(items, patterns, DEFAULT_MATCH_TYPES, include)
+            assert match_items(items, patterns, DEFAULT_MATCH_TYPES, str, include) == expected
+
+
+def test_match_items_calls_key_func_once_per_item():
+    calls = []
+
+    def key_func(item):
+        calls.append(item)
+        return item
+    items = ["apple", "banana", "cherry"]
+    assert match_items(items, ["err"], DEFAULT_MATCH_TYPES, key_func) == ["cherry"]
+    assert calls == items
+
+
+def test_fuzzy_index_matches_fuzzy_list():
+    items = ["apple", "APPLE", "applesauce", "pineapple", "banana", "Bandana", "cherry", "apple"]
+    f = fuzzy(items)
+    index = fuzzy(items, index=True)
+    assert isinstance(index, FuzzyIndex)
+    for patterns in (["apple"], ["APPLE"], ["app"], ["ana"], ["ban", "che"], ["zzz"], ["*"]):
+        for match_types in ([MatchType.EXACT], [MatchType.PREFIX], [MatchType.SUFFIX], None):
+            expected = f.include(*patterns, match_types=match_types)
+            assert index.include(*patterns, match_types=match_types) == expected
+            expected = f.exclude(*patterns, match_types=match_types)
+            assert index.exclude(*patterns, match_types=match_types) == expected
+
+
+def test_fuzzy_index_lookup():
+    index = fuzzy(["apple", "banana", "apricot", "Apple"], index=True)
+    assert index.lookup(MatchType.EXACT, ["apple"]) == [0]
+    assert index.lookup(MatchType.IGNORECASE, ["APPLE"]) == [0, 3]
+    assert index.lookup(MatchType.PREFIX, ["ap"]) == [0, 2]
+    assert index.lookup(MatchType.SUFFIX, ["na", "ot"]) == [1, 2]
+    assert index.lookup(MatchType.REGEX, ["a"]) is None
+
+
+def test_fuzzy_index_preserves_container_type():
+    index = fuzzy({"apple": 1, "banana": 2}, index=True)
+    assert index.include("app").defuzz() == {"apple": 1}
+    index = fuzzy(("apple", "banana"), index=True)
+    assert index.exclude("app", match_types=[MatchType.PREFIX]).defuzz() == ("banana",)
+    with pytest.raises(InvalidFuzzyTypeError):
+        fuzzy(42, index=True)
+
+
+def test_ngram_index_lookup():
+    ngrams = NgramIndex(["apple", "pineapple", "banana", "bandana"])
+    assert ngrams.lookup(MatchType.CONTAINS, ["apple"]) == [0, 1]
+    assert ngrams.lookup(MatchType.CONTAINS, ["ana", "nea"]) == [1, 2, 3]
+    assert ngrams.lookup(MatchType.CONTAINS, ["xyz"]) == []
+    assert ngrams.lookup(MatchType.CONTAINS, ["an"]) is None
+    assert ngrams.lookup(MatchType.PREFIX, ["apple"]) is None
+
+
+def test_fuzzy_list_ngram_matches_scan():
+    items = ["apple", "APPLE", "applesauce", "pineapple", "banana", "Bandana", "cherry"]
+    f = fuzzy(items)
+    ngram = fuzzy(items, ngram=True)
+    index = fuzzy(items, index=True, ngram=True)
+    for patterns in (["apple"], ["ana"], ["pple", "err"], ["an"], ["zzz"]):
+        for match_types in ([MatchType.CONTAINS], None):
+            expected = f.include(*patterns, match_types=match_types)
+            assert ngram.include(*patterns, match_types=match_types) == expected
+            assert index.include(*patterns, match_types=match_types) == expected
+            expected = f.exclude(*patterns, match_types=match_types)
+            assert ngram.exclude(*patterns, match_types=match_types) == expected
+            assert index.exclude(*patterns, match_types=match_types) == expected
+
+
+def test_fuzzy_list_ngram_maintenance():
+    f = fuzzy(["apple", "banana"], ngram=True)
+    assert f.include("ana", match_types=[MatchType.CONTAINS]) == ["banana"]
+    f.append("bandana")
+    f += ["savanna"]
+    assert len(f.ngrams()) == 4
+    assert f.include("ana", match_types=[MatchType.CONTAINS]) == ["banana", "bandana"]
+    f[1] = "cherry"
+    assert f.include("ana", match_types=[MatchType.CONTAINS]) == ["bandana"]
+    f.insert(0, "ananas")
+    assert f.include("ana", match_types=[MatchType.CONTAINS]) == ["ananas", "bandana"]
+
+
+def test_fuzzy_view_matches_eager_chain():
+    items = ["apple", "APPLE", "applesauce", "pineapple", "banana", "Bandana", "cherry"]
+    eager = fuzzy(items).include("app", "ana")
+    eager = eager.exclude("sauce", match_types=[MatchType.CONTAINS]).include("a")
+    view = fuzzy(items).lazy().include("app", "ana")
+    view = view.exclude("sauce", match_types=[MatchType.CONTAINS]).include("a")
+    assert isinstance(view, FuzzyView)
+    assert view.defuzz() == eager.defuzz()
+    assert list(view) == list(view)
+
+
+def test_fuzzy_view_generator_source():
+    consumed = []
+
+    def source():
+        for item in ["apple", "banana", "cherry", "bandana"]:
+            consumed.append(item)
+            yield item
+    view = fuzzy(source(), lazy=True).include("an", match_types=[MatchType.CONTAINS])
+    assert consumed == []
+    matches = iter(view)
+    assert next(matches) == "banana"
+    assert consumed == ["apple", "banana"]
+    assert list(matches) == ["bandana"]
+
+
+def test_fuzzy_view_preserves_tuple():
+    view = fuzzy(("apple", "banana"), lazy=True).exclude("apple")
+    assert view.defuzz() == ("banana",)
+    with pytest.raises(InvalidFuzzyTypeError):
+        fuzzy(42, lazy=True)
+
+
+def test_match_dict():
+    record = {"metadata": {"name": "api-gateway", "tags": ["prod", "edge"]}, "org": "platform"}
+    assert match_dict(record, ["edge"], MATCH_FUNCS[MatchType.EXACT], str, True) == True
+    assert match_dict(record, ["edge"], MATCH_FUNCS[MatchType.EXACT], str, False) == False
+    assert match_dict(record, ["mango"], MATCH_FUNCS[MatchType.EXACT], str, False) == True
+    key_func = key_path("metadata.name")
+    assert match_dict(record, ["platform"], MATCH_FUNCS[MatchType.EXACT], key_func, True) == False
+
+
+def test_key_path():
+    record = {"metadata": {"name": "api", "labels": [{"app": "web"}]}}
+    assert key_path("metadata.name")(record) == ("api",)
+    assert key_path("metadata.labels.0.app", "missing.path")(record) == ("web",)
+    assert key_path("name")(Thing("apple")) == ("apple",)
+
+
+def test_key_path_digit_segments():
+    assert key_path("ports.80")({"ports": {"80": "http"}}) == ("http",)
+    assert key_path("ports.80")({"ports": {80: "http"}}) == ("http",)
+    assert key_path("ports.1")({"ports": ["ssh", "http"]}) == ("http",)
+    assert key_path("ports.1")({"ports": ("ssh", "http")}) == ("http",)
+    assert key_path("ports.2")({"ports": ["ssh", "http"]}) == ()
+    assert key_path("ports.443")({"ports": {"80": "http"}}) == ()
+    records = [{"ports": {"80": "http"}}, {"ports": {"22": "ssh"}}]
+    result = fuzzy(records, key_func=key_path("ports.80")).include("http")
+    assert result.defuzz() == [records[0]]
+
+
+def test_fuzzy_list_of_dicts_with_key_path():
+    records = [
+        {"metadata": {"name": "api-gateway"}, "org": "platform"},
+        {"metadata": {"name": "web"}, "org": "api"},
+        {"metadata": {"name": "api-docs"}, "org": "docs"},
+    ]
+    f = fuzzy(records, key_func=key_path("metadata.name"))
+    assert f.include("api").defuzz() == [records[0], records[2]]
+    assert f.exclude("api", match_types=[MatchType.PREFIX]).defuzz() == [records[1]]
+    assert fuzzy(records).include("api", match_types=[MatchType.EXACT]).defuzz() == [records[1]]
+
+
+def test_fuzzy_dict_with_key_path_values():
+    repos = {"a": {"name": "apple"}, "b": {"name": "banana"}}
+    f = fuzzy(repos, key_func=key_path("name"))
+    assert f.include("ban").defuzz() == {"b": repos["b"]}
+
+
+def test_match_items_workers(monkeypatch):
+    import leatherman.fuzzy
+    monkeypatch.setattr(leatherman.fuzzy, 'PARALLEL_THRESHOLD', 0)
+    items = ["apple", "APPLE", "applesauce", "pineapple", "banana", "Bandana", "cherry"] * 5
+    for patterns in (["apple"], ["APPLE"], ["ana"], ["zzz"]):
+        for include in (True, False):
+            expected = match_items(items, patterns, DEFAULT_MATCH_TYPES, str, include)
+            result = match_items(items, patterns, DEFAULT_MATCH_TYPES, str, include, workers=2)
+            assert result == expected
+
+
+def test_fuzzy_list_workers_with_key_func(monkeypatch):
+    import leatherman.fuzzy
+    monkeypatch.setattr(leatherman.fuzzy, 'PARALLEL_THRESHOLD', 0)
+    repos = [Thing('apple'), Thing('banana'), Thing('cherry'), Thing('bandana')]
+    f = fuzzy(repos, key_func=lambda thing: thing.name)
+    assert f.include("ana", workers=2).defuzz() == [repos[1], repos[3]]
+    result = f.exclude("ana", match_types=[MatchType.CONTAINS], workers=2)
+    assert result.defuzz() == [repos[0], repos[2]]
+
+
+def test_fuzzy_list_query_cache():
+    f = fuzzy(["apple", "banana", "bandana", "cherry"], cache=8)
+    assert f.include("ana").defuzz() == ["banana", "bandana"]
+    assert f.include("ana").defuzz() == ["banana", "bandana"]
+    assert f.cache_info() == CacheInfo(hits=1, misses=1, maxsize=8, currsize=1)
+    f.append("havana")
+    assert f.include("ana").defuzz() == ["banana", "bandana", "havana"]
+    assert f.cache_info().misses == 2
+    assert fuzzy(["apple"]).cache_info() is None
+
+
+def test_fuzzy_list_query_cache_narrows_extended_pattern():
+    f = fuzzy(["apple", "banana", "bandana", "cherry"], cache=8)
+    for pattern, expected in (("b", 2), ("ba", 2), ("ban", 2), ("band", 1), ("bando", 0)):
+        result = f.include(pattern, match_types=[MatchType.CONTAINS])
+        assert len(result) == expected
+    assert f.include("ana", match_types=[MatchType.CONTAINS]).defuzz() == ["banana", "bandana"]
+
+
+def test_query_cache_eviction():
+    cache = QueryCache(maxsize=2)
+    for pattern in ("a", "b", "c"):
+        cache.positions(0, (pattern,), [MatchType.EXACT], True, lambda candidates: [0])
+    assert cache.info().currsize == 2
+    assert cache.get((("a",), (MatchType.EXACT,), True)) is None
+
+
+def test_fuzzy_dict_query_cache_invalidation():
+    f = fuzzy({"apple": 1, "banana": 2}, cache=4)
+    assert f.include("ban").defuzz() == {"banana": 2}
+    f["bandana"] = 3
+    assert f.include("ban").defuzz() == {"banana": 2, "bandana": 3}
+    del f["banana"]
+    assert f.include("ban").defuzz() == {"bandana": 3}
+    assert f.cache_info().hits == 0
+
+
+def test_levenshtein():
+    assert levenshtein("kitten", "sitting") == 3
+    assert levenshtein("", "abc") == 3
+    assert levenshtein("apple", "apple") == 0
+
+
+def test_fuzzy_list_search_ranks_by_tier_position_and_length():
+    f = fuzzy(["pineapple", "applesauce", "Apple", "apple", "apples", "banana"])
+    assert f.search("apple", limit=None).defuzz() == [
+        "apple", "Apple", "apples", "applesauce", "pineapple",
+    ]
+    assert f.search("apple", limit=2).defuzz() == ["apple", "Apple"]
+    assert f.search("zzz").defuzz() == []
+
+
+def test_fuzzy_list_search_scores():
+    f = fuzzy([Thing("api-gateway"), Thing("api")], key_func=thing_name)
+    results = f.search("api", limit=1, distance=True, scores=True)
+    score, thing = results[0]
+    assert thing.name == "api"
+    assert score == Score(tier=0, position=0, ratio=-1.0, distance=0, index=1)
+
+
+def test_fuzzy_dict_search():
+    f = fuzzy({"applesauce": 1, "apple": 2, "banana": 3})
+    assert f.search("app").defuzz() == {"apple": 2, "applesauce": 1}
+    assert list(f.search("app")) == ["apple", "applesauce"]
+
+
+def test_levenshtein_matches_dynamic_programming():
+    def reference(source, target):
+        previous = list(range(len(target) + 1))
+        for row, source_char in enumerate(source, 1):
+            current = [row]
+            for column, target_char in enumerate(target, 1):
+                current.append(min(
+                    previous[column] + 1,
+                    current[column - 1] + 1,
+                    previous[column - 1] + (source_char != target_char),
+                ))
+            previous = current
+        return previous[-1]
+    words = ["", "a", "ab", "kitten", "sitting", "kubernetes", "kubernetse", "abcabcabc", "cba"]
+    for source in words:
+        for target in words:
+            assert levenshtein(source, target) == reference(source, target)
+            assert levenshtein(source, target, 1) == min(reference(source, target), 2)
+
+
+def test_approx_match_type():
+    f = fuzzy(["kubernetes", "kubectl", "terraform"])
+    assert f.include("kubernetse", match_types=[MatchType.APPROX]).defuzz() == ["kubernetes"]
+    assert f.include("terrafrom").defuzz() == []
+    assert f.include("kub").defuzz() == ["kubernetes", "kubectl"]
+    assert f.include("ab", match_types=[MatchType.APPROX]).defuzz() == []
+
+
+def test_approx_is_opt_in():
+    assert MatchType.APPROX not in DEFAULT_MATCH_TYPES
+    assert fuzzy(["host-0001", "host-0002"]).include("host-0003").defuzz() == []
+
+
+def test_approx_max_distance():
+    f = fuzzy(["kubernetes"], match_types=[MatchType.APPROX], max_distance=0)
+    assert f.include("kubernetse").defuzz() == []
+    f = fuzzy(["kubernetes"], match_types=[MatchType.APPROX], max_distance=1)
+    assert f.include("kubernetse").defuzz() == []
+    assert f.include("kubernetez").defuzz() == ["kubernetes"]
+
+
+def test_bktree():
+    tree = BKTree(["book", "books", "cake", "boo", "cape", "cart"])
+    assert sorted(tree.find("bock", 1)) == ["book"]
+    assert sorted(tree.find("cake", 1)) == ["cake", "cape"]
+
+
+def test_fuzzy_index_approx():
+    items = ["kubernetes", "kubectl", "terraform", "kubernetes"]
+    index = fuzzy(items, index=True)
+    assert index.lookup(MatchType.APPROX, ["terrafrom"]) == [2]
+    result = index.include("kubernetse", match_types=[MatchType.APPROX])
+    assert result.defuzz() == ["kubernetes", "kubernetes"]
+    assert index.lookup(MatchType.APPROX, ["kubernetse", "kubernets"]) == [0, 3]
+    words = ["hello", "world"]
+    result = fuzzy(words, index=True).include("helo", "hallo", match_types=[MatchType.APPROX])
+    assert result.defuzz() == ["hello"]
+    result = fuzzy(words).include("helo", "hallo", match_types=[MatchType.APPROX])
+    assert result.defuzz() == ["hello"]
+
+
+def test_key_buffer_lookup_matches_match_funcs():
+    keys = ["apple", "", "Apple", "pineapple", "apple.txt", "banana", "bandana", "ana", "na"]
+    buffer = KeyBuffer(keys)
+    assert list(buffer) == keys
+    assert buffer[3] == "pineapple"
+    for patterns in (
+        ["apple"], ["APPLE"], ["ana"], ["an", "pp"], [""], ["a?a", "*.txt"], ["^a.*e$"], ["anna"],
+    ):
+        for match_type in MatchType:
+            if match_type == MatchType.REGEX and "*.txt" in patterns:
+                continue
+            matcher = compile_patterns(match_type, patterns)
+            expected = [position for position, key in enumerate(keys) if matcher(key)]
+            assert buffer.lookup(match_type, patterns) == expected, (match_type, patterns)
+
+
+def test_fuzzy_list_compact_backend():
+    items = ["apple", "APPLE", "applesauce", "pineapple", "banana", "Bandana", "cherry"]
+    f = fuzzy(items)
+    compact = fuzzy(items, backend='compact')
+    for patterns in (["apple"], ["APPLE"], ["app"], ["ana"], ["cheery"], ["zzz"]):
+        assert compact.include(*patterns) == f.include(*patterns)
+        assert compact.exclude(*patterns) == f.exclude(*patterns)
+    compact.append("havana")
+    result = compact.include("ana", match_types=[MatchType.CONTAINS])
+    assert result == ["banana", "Bandana", "havana"]
+    with pytest.raises(ValueError):
+        fuzzy(items, backend='invalid')
+
+
+def test_stream_iterable_is_incremental():
+    def source():
+        yield "apple"
+        yield "banana"
+        raise AssertionError("stream read past the first match")
+    matches = stream(source(), "ana")
+    assert next(matches) == "banana"
+
+
+def test_stream_exclude_and_match_types():
+    items = ["apple", "banana", "cherry", "Bandana"]
+    assert list(stream(items, ["ana"], include=False)) == ["apple", "cherry"]
+    assert list(stream(items, ["BANDANA", "banana"], match_types=DEFAULT_MATCH_TYPES)) == ["banana"]
+
+
+def test_stream_file(tmp_path):
+    path = tmp_path / "hosts.txt"
+    path.write_text("web-01\r\nweb-02\ndb-01\napi-web\n" + "x" * 10 + "\nlast-web")
+    assert list(stream(path, "web", chunk_size=4)) == ["web-01", "web-02", "api-web", "last-web"]
+    matches = stream(str(path), "web", match_types=[MatchType.PREFIX], include=False)
+    assert list(matches) == ["db-01", "api-web", "x" * 10, "last-web"]
+    assert list(read_lines(path, chunk_size=3)) == [
+        "web-01", "web-02", "db-01", "api-web", "x" * 10, "last-web",
+    ]
+
+
+def test_numpy_keys_lookup():
+    pytest.importorskip('numpy')
+    keys = ["apple", "Apple", "pineapple", "banana", "bandana"]
+    numpy_keys = NumpyKeys(keys)
+    for match_type in (
+        MatchType.EXACT,
+        MatchType.IGNORECASE,
+        MatchType.PREFIX,
+        MatchType.SUFFIX,
+        MatchType.CONTAINS,
+    ):
+        for patterns in (["apple"], ["ana", "App"]):
+            matcher = compile_patterns(match_type, patterns)
+            expected = [position for position, key in enumerate(keys) if matcher(key)]
+            assert numpy_keys.lookup(match_type, patterns) == expected
+    assert numpy_keys.lookup(MatchType.REGEX, ["a"]) is None
+
+
+def test_fuzzy_list_numpy_backend():
+    pytest.importorskip('numpy')
+    items = ["apple", "APPLE", "applesauce", "pineapple", "banana", "Bandana", "cherry"]
+    f = fuzzy(items)
+    vectorized = fuzzy(items, backend='numpy')
+    for patterns in (["apple"], ["APPLE"], ["app"], ["ana"], ["cheery"], ["zzz"]):
+        assert vectorized.include(*patterns) == f.include(*patterns)
+        assert vectorized.exclude(*patterns) == f.exclude(*patterns)
+
+
+def test_fuzzy_list_numpy_backend_unavailable(monkeypatch):
+    import leatherman.fuzzy
+    monkeypatch.setattr(leatherman.fuzzy, 'np', None)
+    with pytest.raises(BackendUnavailableError):
+        fuzzy(["apple"], backend='numpy')
+
+
+def test_match_list_exclude():
+    exact = MATCH_FUNCS[MatchType.EXACT]
+    assert match_list(["apple", "banana"], ["apple"], exact, str, False) == False
+    assert match_list(["apple", "banana"], ["mango", "kiwi"], exact, str, False) == True
+    assert match_list([["apple"], "banana"], ["apple"], exact, str, True) == True
+
+
+def test_match_list_short_circuits():
+    seen = []
+
+    def key_func(item):
+        seen.append(item)
+        return item
+    exact = MATCH_FUNCS[MatchType.EXACT]
+    assert match_list(["apple", "banana", "cherry"], ["apple"], exact, key_func, True)
+    assert seen == ["apple"]
+
+
+def test_fuzzy_list_of_tag_lists():
+    records = [["prod", "edge"], ("dev", "web"), ["prod", ["web", "api"]]]
+    f = fuzzy(records)
+    assert f.include("web", match_types=[MatchType.EXACT]).defuzz() == [records[1], records[2]]
+    assert f.exclude("prod", match_types=[MatchType.EXACT]).defuzz() == [records[1]]
+    assert f.include("PROD").defuzz() == [records[0], records[2]]
+
+
+def test_fuzzy_list_multi_field_include():
+    repos = [
+        {'name': 'api-web', 'org': 'platform'},
+        {'name': 'api-db', 'org': 'data'},
+        {'name': 'web', 'org': 'platform'},
+        {'name': 'apiary', 'org': 'Platform'},
+    ]
+    f = fuzzy(repos, fields={'name': ('name', [MatchType.GLOB]), 'org': 'org'})
+    assert f.include(name="api*", org="platform").defuzz() == [repos[0]]
+    assert f.include(name="api*").defuzz() == [repos[0], repos[1], repos[3]]
+    assert f.include(org="platform").include(name="web").defuzz() == [repos[2]]
+    assert f.exclude(name="api*", org="platform").defuzz() == repos[1:]
+    assert f.include(name="*", org="data").defuzz() == [repos[1]]
+
+
+def test_fuzzy_list_multi_field_tracks_mutation():
+    f = fuzzy([{'name': 'web'}], fields={'name': 'name'})
+    assert f.include(name="ops").defuzz() == []
+    f.append({'name': 'ops'})
+    assert f.include(name="ops").defuzz() == [{'name': 'ops'}]
+
+
+def test_fuzzy_multi_field_unknown():
+    f = fuzzy([{'name': 'web'}], fields={'name': 'name'})
+    with pytest.raises(UnknownFieldError):
+        f.include(team="web")
+
+
+def test_fuzzy_dict_multi_field_matches_values():
+    d = fuzzy(
+        {'a': {'name': 'web', 'org': 'platform'}, 'b': {'name': 'db', 'org': 'data'}},
+        fields={'name': 'name', 'org': 'org'},
+    )
+    assert list(d.include(org="data").keys()) == ['b']
+    assert list(d.exclude(name="web").keys()) == ['b']
+
+
+def test_mapped_index_matches_fuzzy_list(tmp_path):
+    words = ["apple", "Apple", "pineapple", "banana", "", "naïve", "bandana"]
+    path = save_index(words, str(tmp_path / 'words.idx'))
+    f = fuzzy(words)
+    with MappedIndex(path) as index:
+        assert list(index) == words
+        for pattern in ["apple", "APPLE", "app", "ana", "ïv", "aple", "zzz"]:
+            for match_type in MatchType:
+                expected = f.include(pattern, match_types=[match_type]).defuzz()
+                assert index.include(pattern, match_types=[match_type]).defuzz() == expected
+            assert index.exclude(pattern).defuzz() == f.exclude(pattern).defuzz()
+
+
+def test_load_index_staleness(tmp_path):
+    source = tmp_path / 'words.txt'
+    source.write_text("apple\nbanana\n")
+    path = str(tmp_path / 'words.idx')
+    with load_index(path, source=str(source), rebuild=True) as index:
+        assert index.include("ban").defuzz() == ["banana"]
+        assert not index.stale(str(source), digest=True)
+    source.write_text("apple\nbanana\nkiwi\n")
+    with pytest.raises(StaleIndexError):
+        load_index(path, source=str(source))
+    with load_index(path, source=str(source), rebuild=True) as index:
+        assert index.include("kiwi").defuzz() == ["kiwi"]
+
+
+def test_mapped_index_invalid_file(tmp_path):
+    path = tmp_path / 'junk.idx'
+    path.write_bytes(b'junk')
+    with pytest.raises(InvalidIndexError):
+        MappedIndex(str(path))
+
+
+def test_mapped_index_empty_or_truncated_file(tmp_path):
+    path = tmp_path / 'empty.idx'
+    path.write_bytes(b'')
+    with pytest.raises(InvalidIndexError):
+        MappedIndex(str(path))
+    full = save_index(["apple", "banana", "cherry"], str(tmp_path / 'full.idx'))
+    data = open(full, 'rb').read()
+    for size in (INDEX_HEADER.size, INDEX_HEADER.size + 8, len(data) - 1):
+        path.write_bytes(data[:size])
+        with pytest.raises(InvalidIndexError):
+            MappedIndex(str(path))
+    with MappedIndex(full) as index:
+        assert list(index) == ["apple", "banana", "cherry"]
+
+
+def test_flat_keys():
+    assert flat_keys(["apple", "banana"], str) == ["apple", "banana"]
+    assert flat_keys([Thing("apple")], thing_name) == ["apple"]
+    assert flat_keys(["apple", ["banana"]], str) is None
+    assert flat_keys([{"name": "apple"}], key_path("name")) is None
+
+
+def test_keys_cascade_matches_item_cascade():
+    items = ["apple", "Apple", "pineapple", "banana", "bandana", "cherry", ""]
+    for patterns in [("apple",), ("APPLE",), ("an", "ch"), ("zzz",)]:
+        for include in [True, False]:
+            tiers = compile_tiers(patterns, DEFAULT_MATCH_TYPES)
+            expected = [
+                position
+                for position, item
+                in item_cascade(items, patterns, tiers, str, include)
+            ]
+            assert keys_cascade(items, tiers, include) == expected
+
+
+def test_index_parity_over_dicts():
+    records = [{'name': 'web', 'org': 'platform'}, {'name': 'api', 'org': 'data'}]
+    plain = fuzzy(records)
+    queries = [("name", MatchType.CONTAINS), ("web", MatchType.EXACT), ("at", MatchType.CONTAINS)]
+    for pattern, match_type in queries:
+        match_types = [match_type]
+        expected = plain.include(pattern, match_types=match_types).defuzz()
+        for options in (dict(ngram=True), dict(index=True)):
+            result = fuzzy(records, **options).include(pattern, match_types=match_types)
+            assert result.defuzz() == expected
+        expected = plain.exclude(pattern, match_types=match_types).defuzz()
+        result = fuzzy(records, index=True).exclude(pattern, match_types=match_types)
+        assert result.defuzz() == expected
+
+
+def test_index_parity_with_key_path():
+    records = [{'name': 'web'}, {'name': 'webapp'}, {'name': 'api'}]
+    plain = fuzzy(records, key_func=key_path('name'))
+    index = fuzzy(records, key_func=key_path('name'), index=True)
+    ngram = fuzzy(records, key_func=key_path('name'), ngram=True)
+    for match_type in [MatchType.EXACT, MatchType.PREFIX, MatchType.CONTAINS]:
+        expected = plain.include("web", match_types=[match_type]).defuzz()
+        assert index.include("web", match_types=[match_type]).defuzz() == expected
+        assert ngram.include("web", match_types=[match_type]).defuzz() == expected
+    ngram.append({'name': 'webhook'})
+    assert ngram.include("bho", match_types=[MatchType.CONTAINS]).defuzz() == [{'name': 'webhook'}]
+
+
+def test_index_dict_with_key_func():
+    things = {'a': Thing('apple'), 'b': Thing('banana')}
+    index = fuzzy(things, key_func=thing_name, index=True)
+    assert list(index.include("ban").defuzz().keys()) == ['b']
+    assert list(fuzzy(things, key_func=thing_name).include("ban").keys()) == ['b']
+
+
+def test_fuzzy_list_results_keep_options():
+    f = fuzzy(["apple", "banana", "bandana", "cherry"], backend='compact', ngram=True, cache=4)
+    result = f.include("an", match_types=[MatchType.CONTAINS])
+    assert result.buffer() is not None
+    assert result.ngrams() is not None
+    assert result.cache_info().maxsize == 4
+    assert result.include("band").defuzz() == ["bandana"]
+    assert f.search("ban").buffer() is not None
+
+
+def test_fuzzy_multi_field_reserved_names():
+    for name in RESERVED_FIELDS:
+        with pytest.raises(ReservedFieldError):
+            fuzzy([{'workers': 'web'}], fields={name: name})
+        with pytest.raises(ReservedFieldError):
+            fuzzy({'a': {'workers': 'web'}}, fields={name: name})